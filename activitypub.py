@@ -3,21 +3,143 @@ ActivityPub integration for SimpleBlog
 Enables Fediverse compatibility by making the blog an ActivityPub server
 """
 import json
+import os
 import requests
 from datetime import datetime
-from urllib.parse import urljoin
-from flask import request, jsonify, url_for
+from email.utils import formatdate
+from urllib.parse import urljoin, urlparse
+from flask import request, jsonify, url_for, Response
 import hashlib
 import base64
+import logging
+import orjson
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 
+# PEM file holding the actor's RSA signing key, generated on first use
+PRIVATE_KEY_FILE = 'activitypub_private_key.pem'
+
+# Upper bound on concurrent deliveries when fanning out to follower inboxes
+DELIVERY_MAX_WORKERS = 32
+
+@lru_cache(maxsize=1024)
+def activity_id_hash(path):
+    """Hash an article path into the stable suffix used for its activity ID"""
+    return hashlib.blake2b(path.encode(), digest_size=16).hexdigest()
+
+def content_etag(body):
+    """ETag for a serialized response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def body_digest(body):
+    """Digest header value for a request body"""
+    return "SHA-256=" + base64.b64encode(hashlib.sha256(body).digest()).decode('ascii')
+
+def load_or_create_private_key(path=PRIVATE_KEY_FILE):
+    """Load the actor's RSA private key, generating and saving one if missing"""
+    try:
+        with open(path, 'rb') as f:
+            return serialization.load_pem_private_key(f.read(), password=None)
+    except FileNotFoundError:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+        # Write the key to a private temp file and link it into place, so a
+        # worker that loses the race never reads a half-written key
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pem)
+                f.flush()
+                os.fsync(f.fileno())
+            os.link(tmp_path, path)
+        except FileExistsError:
+            # Another worker generated the key first; use theirs
+            with open(path, 'rb') as f:
+                return serialization.load_pem_private_key(f.read(), password=None)
+        finally:
+            os.unlink(tmp_path)
+        return private_key
+
 class ActivityPubServer:
     def __init__(self, app, base_url):
         self.app = app
         self.base_url = base_url
+        # URL prefixes shared by every outbox entry
+        self._actor_id = f"{base_url}/users/blog"
+        self._articles_prefix = f"{base_url}/articles/"
+        self._activities_prefix = f"{base_url}/activities/"
+        self._private_key = load_or_create_private_key()
+        self._public_key_pem = self._private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode('ascii')
+        # Inbox activity type -> handler
+        self._inbox_handlers = {
+            'Follow': self.handle_follow,
+            'Like': self.handle_like,
+            'Create': self.handle_create,
+        }
+        self._inbox_queue = queue.Queue()
+        threading.Thread(target=self._process_inbox, daemon=True).start()
+        self.refresh_cache()
         self.setup_routes()
-        
+
+    def refresh_cache(self):
+        """Pre-serialize the actor and webfinger documents, which never change after startup"""
+        self._actor_body = orjson.dumps(self.build_actor())
+        self._actor_etag = content_etag(self._actor_body)
+        self._webfinger_resource = f"acct:blog@{urlparse(self.base_url).netloc}"
+        self._webfinger_body = orjson.dumps(self.build_webfinger(self._webfinger_resource))
+        self._webfinger_etag = content_etag(self._webfinger_body)
+
+    def cacheable_response(self, body, etag, mimetype, max_age, weak=False):
+        """Build a publicly cacheable response, answering 304 when the client's ETag matches"""
+        response = Response(body, mimetype=mimetype)
+        response.set_etag(etag, weak=weak)
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response.make_conditional(request)
+
+    def build_webfinger(self, resource):
+        """Build the WebFinger document for a resource"""
+        return {
+            "subject": resource,
+            "links": [{
+                "rel": "self",
+                "type": "application/activity+json",
+                "href": f"{self.base_url}/users/blog"
+            }]
+        }
+
+    def build_actor(self):
+        """Build the ActivityPub actor document for the blog"""
+        return {
+            "@context": "https://www.w3.org/ns/activitystreams",
+            "type": "Person",
+            "id": f"{self.base_url}/users/blog",
+            "name": "My Blog",
+            "preferredUsername": "blog",
+            "summary": "AI-powered blog with GitHub integration",
+            "inbox": f"{self.base_url}/users/blog/inbox",
+            "outbox": f"{self.base_url}/users/blog/outbox",
+            "followers": f"{self.base_url}/users/blog/followers",
+            "following": f"{self.base_url}/users/blog/following",
+            "publicKey": {
+                "id": f"{self.base_url}/users/blog#main-key",
+                "owner": f"{self.base_url}/users/blog",
+                "publicKeyPem": self.get_public_key()
+            }
+        }
+
     def setup_routes(self):
         """Setup ActivityPub routes"""
         
@@ -25,86 +147,88 @@ class ActivityPubServer:
         def webfinger():
             """WebFinger endpoint for user discovery"""
             resource = request.args.get('resource')
+            if resource == self._webfinger_resource:
+                return self.cacheable_response(
+                    self._webfinger_body, self._webfinger_etag, 'application/jrd+json', 300
+                )
             if resource and resource.startswith('acct:blog@'):
-                return jsonify({
-                    "subject": resource,
-                    "links": [{
-                        "rel": "self",
-                        "type": "application/activity+json",
-                        "href": f"{self.base_url}/users/blog"
-                    }]
-                })
+                body = orjson.dumps(self.build_webfinger(resource))
+                return self.cacheable_response(body, content_etag(body), 'application/jrd+json', 300)
             return jsonify({"error": "Resource not found"}), 404
             
         @self.app.route('/users/blog')
         def actor():
             """Actor endpoint - represents your blog as an ActivityPub actor"""
-            return jsonify({
-                "@context": "https://www.w3.org/ns/activitystreams",
-                "type": "Person",
-                "id": f"{self.base_url}/users/blog",
-                "name": "My Blog",
-                "preferredUsername": "blog",
-                "summary": "AI-powered blog with GitHub integration",
-                "inbox": f"{self.base_url}/users/blog/inbox",
-                "outbox": f"{self.base_url}/users/blog/outbox",
-                "followers": f"{self.base_url}/users/blog/followers",
-                "following": f"{self.base_url}/users/blog/following",
-                "publicKey": {
-                    "id": f"{self.base_url}/users/blog#main-key",
-                    "owner": f"{self.base_url}/users/blog",
-                    "publicKeyPem": self.get_public_key()
-                }
-            })
+            return self.cacheable_response(
+                self._actor_body, self._actor_etag, 'application/activity+json', 300
+            )
             
         @self.app.route('/users/blog/outbox')
         def outbox():
-            """Outbox endpoint - shows published articles as ActivityPub objects"""
-            articles = get_articles_from_db()  # Your existing function
-            
-            activities = []
-            for article in articles[:20]:  # Limit to recent articles
-                activity = {
-                    "@context": "https://www.w3.org/ns/activitystreams",
-                    "type": "Create",
-                    "id": f"{self.base_url}/activities/{hashlib.md5(article['path'].encode()).hexdigest()}",
-                    "actor": f"{self.base_url}/users/blog",
-                    "published": datetime.now().isoformat(),
-                    "object": {
-                        "type": "Article",
-                        "id": f"{self.base_url}/articles/{article['path']}",
-                        "name": article['title'],
-                        "content": article['content'][:500] + "...",
-                        "url": f"{self.base_url}/articles/{article['path']}",
-                        "attributedTo": f"{self.base_url}/users/blog"
+            """Outbox endpoint - streams published articles as ActivityPub objects"""
+            from app import get_articles_summary
+            # Limit to recent articles, with content already cut down to the snippet
+            articles = get_articles_summary(limit=20, snippet_len=500)
+
+            def generate():
+                # Emit the collection wrapper around one serialized activity per article
+                yield (b'{"@context":"https://www.w3.org/ns/activitystreams",'
+                       b'"type":"OrderedCollection","totalItems":%d,"orderedItems":[' % len(articles))
+                actor_id = self._actor_id
+                published = datetime.now().isoformat()
+                for i, article in enumerate(articles):
+                    article_url = self._articles_prefix + article['path']
+                    activity = {
+                        "@context": "https://www.w3.org/ns/activitystreams",
+                        "type": "Create",
+                        "id": self._activities_prefix + activity_id_hash(article['path']),
+                        "actor": actor_id,
+                        "published": published,
+                        "object": {
+                            "type": "Article",
+                            "id": article_url,
+                            "name": article['title'],
+                            "content": article['snippet'] + "...",
+                            "url": article_url,
+                            "attributedTo": actor_id
+                        }
                     }
-                }
-                activities.append(activity)
-                
-            return jsonify({
-                "@context": "https://www.w3.org/ns/activitystreams",
-                "type": "OrderedCollection",
-                "totalItems": len(activities),
-                "orderedItems": activities
-            })
+                    yield (b',' if i else b'') + orjson.dumps(activity)
+                yield b']}'
+
+            # The body is streamed, so tag it by its article data; published
+            # timestamps differ between requests, hence a weak ETag
+            etag = content_etag(orjson.dumps(articles))
+            return self.cacheable_response(generate(), etag, 'application/activity+json', 60, weak=True)
             
         @self.app.route('/users/blog/inbox', methods=['POST'])
         def inbox():
             """Inbox endpoint - receives ActivityPub activities (likes, follows, etc.)"""
-            activity = request.get_json()
+            try:
+                activity = orjson.loads(request.get_data())
+            except orjson.JSONDecodeError:
+                return jsonify({"error": "Invalid JSON"}), 400
+            if not isinstance(activity, dict):
+                return jsonify({"error": "Invalid activity"}), 400
             
-            if activity['type'] == 'Follow':
-                # Handle new follower
-                self.handle_follow(activity)
-            elif activity['type'] == 'Like':
-                # Handle like on article
-                self.handle_like(activity)
-            elif activity['type'] == 'Create' and activity['object']['type'] == 'Note':
-                # Handle reply/comment
-                self.handle_reply(activity)
+            # Handlers touch storage and may call back to the sender, so leave
+            # them to the background worker and acknowledge right away
+            if activity.get('type') in self._inbox_handlers:
+                self._inbox_queue.put(activity)
                 
-            return jsonify({"status": "accepted"})
+            return jsonify({"status": "accepted"}), 202
     
+    def _process_inbox(self):
+        """Background worker that dispatches queued inbox activities"""
+        while True:
+            activity = self._inbox_queue.get()
+            try:
+                self._inbox_handlers[activity['type']](activity)
+            except Exception as e:
+                logging.error(f"❌ Failed to handle {activity['type']} activity: {e}")
+            finally:
+                self._inbox_queue.task_done()
+
     def handle_follow(self, activity):
         """Handle follow activity from Fediverse"""
         follower = activity['actor']
@@ -118,6 +242,12 @@ class ActivityPubServer:
         # Store like in database
         # Update article like count
         
+    def handle_create(self, activity):
+        """Handle create activity, only Notes (replies) are of interest"""
+        obj = activity.get('object')
+        if isinstance(obj, dict) and obj.get('type') == 'Note':
+            self.handle_reply(activity)
+
     def handle_reply(self, activity):
         """Handle replies/comments from Fediverse"""
         comment = activity['object']
@@ -126,12 +256,48 @@ class ActivityPubServer:
 
     def get_public_key(self):
         """Get RSA public key for ActivityPub signing"""
-        # Generate or load from config
-        return "-----BEGIN PUBLIC KEY-----\n...\n-----END PUBLIC KEY-----"
+        return self._public_key_pem
+
+    def sign_request(self, inbox_url, body, digest=None):
+        """Build HTTP Signature headers for POSTing body to inbox_url"""
+        if digest is None:
+            digest = body_digest(body)
+        url = urlparse(inbox_url)
+        target = url.path or '/'
+        if url.query:
+            target += f"?{url.query}"
+        date = formatdate(usegmt=True)
+        signed_string = f"(request-target): post {target}\nhost: {url.netloc}\ndate: {date}\ndigest: {digest}"
+        signature = self._private_key.sign(signed_string.encode('utf-8'), padding.PKCS1v15(), hashes.SHA256())
+        return {
+            "Host": url.netloc,
+            "Date": date,
+            "Digest": digest,
+            "Signature": (
+                f'keyId="{self._actor_id}#main-key",algorithm="rsa-sha256",'
+                f'headers="(request-target) host date digest",'
+                f'signature="{base64.b64encode(signature).decode("ascii")}"'
+            )
+        }
 
 # Cross-posting function
-def post_to_fediverse(article):
-    """Post new article to Fediverse followers"""
+def send_to_inbox(inbox_url, body, signer=None, digest=None):
+    """Deliver a serialized activity to a remote inbox, signed when a signer is given"""
+    headers = {"Content-Type": "application/activity+json"}
+    if signer:
+        headers.update(signer(inbox_url, body, digest))
+    try:
+        response = requests.post(inbox_url, data=body, headers=headers, timeout=10)
+        return response.status_code < 300
+    except requests.RequestException as e:
+        logging.warning(f"⚠️ Failed to deliver activity to {inbox_url}: {e}")
+        return False
+
+def post_to_fediverse(article, base_url, signer=None):
+    """Post new article to Fediverse followers
+
+    signer is normally ActivityPubServer.sign_request.
+    """
     activity = {
         "@context": "https://www.w3.org/ns/activitystreams",
         "type": "Create",
@@ -143,8 +309,13 @@ def post_to_fediverse(article):
             "url": f"{base_url}/articles/{article['path']}"
         }
     }
+    body = orjson.dumps(activity)
+    # Every follower receives the same body, so hash it once
+    digest = body_digest(body)
     
-    # Send to all followers' inboxes
+    # Send to all followers' inboxes concurrently
     followers = get_followers_from_db()
-    for follower in followers:
-        send_to_inbox(follower['inbox'], activity)
+    if not followers:
+        return
+    with ThreadPoolExecutor(max_workers=min(DELIVERY_MAX_WORKERS, len(followers))) as executor:
+        list(executor.map(lambda follower: send_to_inbox(follower['inbox'], body, signer, digest), followers))
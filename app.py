@@ -1,17 +1,24 @@
-from flask import Flask, render_template, send_from_directory, request, jsonify, session
+from flask import Flask, Response, send_from_directory, request, jsonify, session
+from flask.json.provider import JSONProvider, DefaultJSONProvider
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.security import generate_password_hash, check_password_hash
 import os
-import json
 import hashlib
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from functools import wraps
-from collections import defaultdict, Counter
+from functools import wraps, lru_cache
+from collections import defaultdict, deque, Counter
 import sqlite3
-from threading import Lock
+from threading import Lock, Thread, local
+from queue import Queue, Empty, Full
 import base64
+import ipaddress
 import logging
+import time
+import orjson
 try:
     # Prefer the newer gemini-2.5-flash module
     import google.generativeai as genai
@@ -21,6 +28,12 @@ except ImportError:
 from PIL import Image
 from io import BytesIO
 import openai
+from concurrent.futures import ThreadPoolExecutor
+try:
+    # Optional: local GeoLite2 lookups instead of the ip-api.com web service
+    import maxminddb
+except ImportError:
+    maxminddb = None
 
 # Bluesky integration will be imported after app creation
 
@@ -37,208 +50,622 @@ logging.basicConfig(
 # Configuration file path
 CONFIG_FILE = 'config.json'
 DEFAULT_PASSWORD = 'password'
+# Memory-hard and roughly half the latency of Werkzeug's default 600k-round pbkdf2
+PASSWORD_HASH_METHOD = 'scrypt'
+# Password checks allowed per client IP within PASSWORD_ATTEMPT_WINDOW seconds;
+# each one runs the deliberately slow hash, so cap how often it can be forced
+PASSWORD_ATTEMPT_LIMIT = 5
+PASSWORD_ATTEMPT_WINDOW = 60
+_password_attempts = defaultdict(deque)
+_password_attempts_lock = Lock()
 ANALYTICS_DB = 'analytics.db'
 
-# Thread lock for database operations
-db_lock = Lock()
+# Visits waiting to be geolocated and written by the analytics worker
+ANALYTICS_QUEUE_SIZE = 10000
+analytics_queue = Queue(maxsize=ANALYTICS_QUEUE_SIZE)
+# The worker waits up to this long after the first visit so bursts share one
+# transaction, and never writes more than ANALYTICS_BATCH_SIZE rows at once
+ANALYTICS_FLUSH_WINDOW = 0.1
+ANALYTICS_BATCH_SIZE = 500
+# Seconds the serialized /api/analytics/stats response is reused; the worker
+# also drops it after each flush so this only bounds other processes' writes
+ANALYTICS_STATS_TTL = 30
+_stats_cache = {'expires_at': 0, 'body': None}
+
+# IP -> (country, expires_at) cache for geolocation lookups
+GEO_CACHE_TTL = 24 * 3600
+GEO_FAILURE_TTL = 5 * 60
+GEO_CACHE_MAX_SIZE = 10000
+# ip-api.com accepts at most 100 IPs per batch request
+GEO_BATCH_SIZE = 100
+geo_cache = {}
+geo_cache_lock = Lock()
+# Shared session so lookups reuse keep-alive connections to ip-api.com
+geo_http = requests.Session()
+geo_http.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=1, backoff_factor=0.1)))
+# Local MaxMind database; when present (and maxminddb is installed) it
+# replaces the ip-api.com lookups entirely
+GEOIP_DB = os.environ.get('GEOIP_DB', 'GeoLite2-Country.mmdb')
+
+# Articles waiting to be cross-posted to Bluesky, retried with exponential backoff
+bluesky_queue = Queue()
+BLUESKY_POST_ATTEMPTS = 3
+
+# How often the background thread runs PRAGMA optimize and prunes old visits
+DB_OPTIMIZE_INTERVAL = 15 * 60
+# Raw visit rows are only kept this long, the daily rollup keeps the totals
+ANALYTICS_RETENTION_DAYS = 30
+
+# Statements run on every analytics flush; sqlite3 caches the compiled form
+# per connection, keyed by the SQL text, so hot queries live in constants
+SQL_INSERT_VISITS = 'INSERT INTO analytics (ip_address, article, country, user_agent, timestamp) VALUES (?, ?, ?, ?, ?)'
+SQL_UPSERT_DAILY = '''
+    INSERT INTO analytics_daily (date, article, country, hits) VALUES (?, ?, ?, ?)
+    ON CONFLICT (date, article, country) DO UPDATE SET hits = hits + excluded.hits
+'''
+SQL_INSERT_VISITOR = 'INSERT OR IGNORE INTO analytics_visitors (ip_address) VALUES (?)'
+# Every dashboard figure in one statement; the three lists come back as JSON arrays
+SQL_ANALYTICS_STATS = '''
+    SELECT
+        (SELECT COALESCE(SUM(hits), 0) FROM analytics_daily),
+        (SELECT COUNT(*) FROM analytics_visitors),
+        (SELECT json_group_array(json_object('article', article, 'views', views, 'countries', json(countries)))
+         FROM (SELECT article, SUM(hits) AS views, json_group_array(DISTINCT country) AS countries
+               FROM analytics_daily WHERE article != ''
+               GROUP BY article ORDER BY views DESC LIMIT 10)),
+        (SELECT json_group_array(json_object('country', country, 'visits', visits))
+         FROM (SELECT country, SUM(hits) AS visits
+               FROM analytics_daily WHERE country != 'Unknown'
+               GROUP BY country ORDER BY visits DESC LIMIT 10)),
+        (SELECT json_group_array(json_object('date', date, 'visits', visits))
+         FROM (SELECT date, SUM(hits) AS visits
+               FROM analytics_daily WHERE date >= DATE('now', '-30 days')
+               GROUP BY date ORDER BY date DESC))
+'''
+
+# Article statements, shared by the helpers below
+# Updates existing rows in place (keeping id and created_at) and leaves rows
+# whose content hasn't changed untouched
+SQL_SAVE_ARTICLE = '''
+    INSERT INTO articles 
+    (title, content, tag, repo, path, image_url, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (path) DO UPDATE SET
+        title = excluded.title,
+        content = excluded.content,
+        tag = excluded.tag,
+        repo = excluded.repo,
+        image_url = excluded.image_url,
+        updated_at = excluded.updated_at
+    WHERE title IS NOT excluded.title
+        OR content IS NOT excluded.content
+        OR tag IS NOT excluded.tag
+        OR repo IS NOT excluded.repo
+        OR image_url IS NOT excluded.image_url
+'''
+SQL_SELECT_EXISTING_PATHS = '''
+    SELECT path FROM articles WHERE path IN (SELECT value FROM json_each(?))
+'''
+SQL_SELECT_ARTICLES = '''
+    SELECT title, content, tag, repo, path, image_url
+    FROM articles
+    ORDER BY created_at DESC, updated_at DESC
+'''
+SQL_SELECT_ARTICLE_SUMMARIES = '''
+    SELECT title, path, substr(content, 1, ?)
+    FROM articles
+    ORDER BY created_at DESC, updated_at DESC
+    LIMIT ?
+'''
+SQL_ARTICLES_VERSION = 'SELECT COUNT(*), MAX(updated_at) FROM articles'
+SQL_UPDATE_ARTICLE_IMAGE = '''
+    UPDATE articles 
+    SET image_url = ?, updated_at = ?
+    WHERE path = ?
+'''
+SQL_DELETE_ARTICLES = 'DELETE FROM articles'
+
+def connect_db():
+    """Open a connection to the analytics database with per-connection tuning applied"""
+    # Connections live for the whole process, so give them room to keep
+    # every statement the app uses compiled
+    conn = sqlite3.connect(ANALYTICS_DB, cached_statements=256)
+    # Writers are serialized by SQLite itself; wait for the lock instead of failing
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA synchronous=NORMAL')  # Safe with WAL, fsyncs only at checkpoints
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')  # 64MB page cache
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+# Each thread keeps its own connection open for the life of the process
+_db_local = local()
+
+def get_db():
+    """Return this thread's analytics database connection, opening it on first use"""
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = connect_db()
+        _db_local.conn = conn
+    return conn
 
 def init_db():
     """Initialize the analytics database and articles database"""
-    with db_lock:
-        conn = sqlite3.connect(ANALYTICS_DB)
-        cursor = conn.cursor()
-        
-        # Create table for storing analytics data
+    conn = connect_db()
+    cursor = conn.cursor()
+    
+    # WAL lets readers run alongside the writer and persists in the file.
+    # auto_vacuum only takes effect on a new database (or after VACUUM).
+    cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
+    # Create table for storing analytics data
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            ip_address TEXT,
+            article TEXT,
+            country TEXT,
+            user_agent TEXT
+        )
+    ''')
+
+    # Indexes backing the analytics stats queries; the partial ones carry
+    # the same WHERE clauses as the queries so the planner can use them
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analytics_article ON analytics(article)
+        WHERE article IS NOT NULL AND article != ''
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analytics_country ON analytics(country)
+        WHERE country != 'Unknown'
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_ts ON analytics(timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_ip ON analytics(ip_address)')
+
+    # Daily per-article/per-country hit counts, kept up to date by the
+    # analytics worker so the stats endpoint never scans raw visits. Every
+    # gunicorn worker runs this, so the check, create and backfill share one
+    # write transaction and only the first worker to get the lock backfills.
+    conn.commit()
+    cursor.execute('BEGIN IMMEDIATE')
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'analytics_daily'")
+    backfill_rollup = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_daily (
+            date TEXT NOT NULL,
+            article TEXT NOT NULL DEFAULT '',
+            country TEXT NOT NULL DEFAULT 'Unknown',
+            hits INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (date, article, country)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_visitors (
+            ip_address TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+    ''')
+    if backfill_rollup:
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS analytics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                ip_address TEXT,
-                article TEXT,
-                country TEXT,
-                user_agent TEXT
-            )
+            INSERT INTO analytics_daily (date, article, country, hits)
+            SELECT DATE(timestamp), COALESCE(article, ''), COALESCE(country, 'Unknown'), COUNT(*)
+            FROM analytics
+            GROUP BY 1, 2, 3
         ''')
-        
-        # Create table for storing articles data
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                tag TEXT,
-                repo TEXT,
-                path TEXT UNIQUE,
-                image_url TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
+            INSERT OR IGNORE INTO analytics_visitors (ip_address)
+            SELECT DISTINCT ip_address FROM analytics WHERE ip_address IS NOT NULL
         ''')
-        
-        conn.commit()
-        conn.close()
+    conn.commit()
 
-def get_country_from_ip(ip_address):
-    """Get country from IP address using a free geolocation API"""
+    # Gather planner statistics once; PRAGMA optimize keeps them fresh afterwards
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+    if cursor.fetchone() is None:
+        cursor.execute('ANALYZE')
+
+    # Create table for storing articles data
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            tag TEXT,
+            repo TEXT,
+            path TEXT UNIQUE,
+            image_url TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # Matches the ORDER BY of the article listing queries so they skip the sort
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_articles_created_updated
+        ON articles(created_at DESC, updated_at DESC)
+    ''')
+    
+    conn.commit()
+    conn.close()
+
+def open_geoip_db():
+    """Open the local GeoLite2 database memory-mapped, None if it isn't available"""
+    if maxminddb is None or not os.path.exists(GEOIP_DB):
+        return None
+    try:
+        reader = maxminddb.open_database(GEOIP_DB, maxminddb.MODE_MMAP)
+        logging.info(f"✅ Using local GeoIP database {GEOIP_DB}")
+        return reader
+    except Exception as e:
+        logging.warning(f"⚠️ Failed to open GeoIP database {GEOIP_DB}: {e}")
+        return None
+
+geo_reader = open_geoip_db()
+
+def lookup_country_locally(ip_address):
+    """Look up country for an IP address in the local GeoLite2 database"""
+    try:
+        record = geo_reader.get(ip_address)
+    except ValueError:
+        # Not a valid IP address
+        return 'Unknown'
+    if not record:
+        return 'Unknown'
+    country = record.get('country') or record.get('registered_country') or {}
+    return country.get('names', {}).get('en', 'Unknown')
+
+def fetch_country_from_ip(ip_address):
+    """Look up country for an IP address using a free geolocation API, None on failure"""
     try:
         # Use a free IP geolocation service
-        response = requests.get(f'http://ip-api.com/json/{ip_address}', timeout=2)
+        response = geo_http.get(f'http://ip-api.com/json/{ip_address}', timeout=2)
         if response.status_code == 200:
             data = response.json()
             return data.get('country', 'Unknown')
     except:
         pass
-    return 'Unknown'
+    return None
+
+def is_local_ip(ip_address):
+    """Check whether an IP address is private, loopback or otherwise not geolocatable"""
+    try:
+        ip = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return False
+    return ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved
+
+def get_country_from_ip(ip_address):
+    """Get country from IP address, caching results so repeat visitors skip the API"""
+    if is_local_ip(ip_address):
+        return 'Local'
+    if geo_reader:
+        return lookup_country_locally(ip_address)
+    
+    now = time.time()
+    with geo_cache_lock:
+        cached = geo_cache.get(ip_address)
+    if cached and cached[1] > now:
+        return cached[0]
+    
+    country = fetch_country_from_ip(ip_address)
+    # Cache failures briefly too so an outage doesn't trigger a retry per visit
+    if country is None:
+        return cache_country(ip_address, 'Unknown', GEO_FAILURE_TTL)
+    return cache_country(ip_address, country, GEO_CACHE_TTL)
+
+def cache_country(ip_address, country, ttl):
+    """Store a geolocation result in the IP cache and return the country"""
+    now = time.time()
+    with geo_cache_lock:
+        if len(geo_cache) >= GEO_CACHE_MAX_SIZE:
+            # Drop expired entries, then the oldest ones if still over the limit
+            for ip in [ip for ip, (_, expires_at) in geo_cache.items() if expires_at <= now]:
+                del geo_cache[ip]
+            while len(geo_cache) >= GEO_CACHE_MAX_SIZE:
+                del geo_cache[next(iter(geo_cache))]
+        geo_cache[ip_address] = (country, now + ttl)
+    return country
+
+def prefetch_countries(ip_addresses):
+    """Resolve uncached IPs through ip-api.com's batch endpoint and cache the results
+
+    IPs in a batch that fails are cached as 'Unknown' for GEO_FAILURE_TTL, so
+    the worker doesn't fall back to one lookup per IP while the API is down.
+    """
+    if geo_reader:
+        return
+    
+    now = time.time()
+    with geo_cache_lock:
+        missing = [
+            ip for ip in dict.fromkeys(ip_addresses)
+            if ip and not is_local_ip(ip) and not (ip in geo_cache and geo_cache[ip][1] > now)
+        ]
+    
+    for start in range(0, len(missing), GEO_BATCH_SIZE):
+        batch = missing[start:start + GEO_BATCH_SIZE]
+        try:
+            response = geo_http.post(
+                'http://ip-api.com/batch',
+                params={'fields': 'country,query'},
+                json=batch,
+                timeout=5
+            )
+            if response.status_code == 200:
+                for result in response.json():
+                    cache_country(result['query'], result.get('country', 'Unknown'), GEO_CACHE_TTL)
+                continue
+            logging.warning(f"⚠️ Batch geolocation lookup returned {response.status_code}")
+        except Exception as e:
+            logging.warning(f"⚠️ Batch geolocation lookup failed: {e}")
+        for ip in batch:
+            cache_country(ip, 'Unknown', GEO_FAILURE_TTL)
 
 def track_visit(article=None):
-    """Track a visit to the site or specific article"""
+    """Queue a visit to the site or specific article for the analytics worker"""
     try:
         # Get visitor's IP address
         ip_address = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
         if ip_address and ',' in ip_address:
             ip_address = ip_address.split(',')[0].strip()
         
-        # Get country from IP
-        country = get_country_from_ip(ip_address)
-        
         # Get user agent
         user_agent = request.headers.get('User-Agent', '')
         
-        # Store in database
-        with db_lock:
-            conn = sqlite3.connect(ANALYTICS_DB)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO analytics (ip_address, article, country, user_agent) VALUES (?, ?, ?, ?)',
-                (ip_address, article, country, user_agent)
-            )
-            conn.commit()
-            conn.close()
+        # Stamp the visit now in SQLite's CURRENT_TIMESTAMP format, since the
+        # row is written later; geolocation happens on the worker thread
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        analytics_queue.put_nowait((ip_address, article, user_agent, timestamp))
+    except Full:
+        logging.warning("⚠️ Analytics queue is full, dropping visit")
     except Exception as e:
         print(f"Error tracking visit: {e}")
 
+def analytics_worker():
+    """Background loop that geolocates queued visits and stores them in batches"""
+    while True:
+        visits = [analytics_queue.get()]
+        deadline = time.monotonic() + ANALYTICS_FLUSH_WINDOW
+        while len(visits) < ANALYTICS_BATCH_SIZE:
+            try:
+                visits.append(analytics_queue.get(timeout=max(0, deadline - time.monotonic())))
+            except Empty:
+                break
+        
+        try:
+            prefetch_countries([visit[0] for visit in visits])
+            rows = [
+                (ip_address, article, get_country_from_ip(ip_address), user_agent, timestamp)
+                for ip_address, article, user_agent, timestamp in visits
+            ]
+            conn = get_db()
+            with conn:
+                # Take the write lock before doing any work so a busy database
+                # is waited out up front rather than partway through the batch
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany(SQL_INSERT_VISITS, rows)
+                update_analytics_rollup(conn, rows)
+            _stats_cache['expires_at'] = 0
+        except Exception as e:
+            logging.error(f"❌ Failed to store {len(visits)} visits: {e}")
+
+def update_analytics_rollup(conn, rows):
+    """Fold a batch of stored visit rows into the daily rollup and visitor tables"""
+    hits = Counter(
+        (timestamp[:10], article or '', country or 'Unknown')
+        for _, article, country, _, timestamp in rows
+    )
+    conn.executemany(SQL_UPSERT_DAILY, [(*key, count) for key, count in hits.items()])
+    conn.executemany(SQL_INSERT_VISITOR, {(row[0],) for row in rows if row[0]})
+
+def optimize_db_periodically():
+    """Background loop that prunes old raw visits and keeps SQLite's planner statistics fresh"""
+    while True:
+        time.sleep(DB_OPTIMIZE_INTERVAL)
+        try:
+            conn = get_db()
+            with conn:
+                conn.execute(
+                    "DELETE FROM analytics WHERE timestamp < datetime('now', ?)",
+                    (f'-{ANALYTICS_RETENTION_DAYS} days',)
+                )
+            conn.execute('PRAGMA incremental_vacuum').fetchall()
+        except Exception as e:
+            logging.warning(f"⚠️ Pruning old analytics failed: {e}")
+        try:
+            get_db().execute('PRAGMA optimize')
+        except Exception as e:
+            logging.warning(f"⚠️ PRAGMA optimize failed: {e}")
+
 init_db()
+Thread(target=analytics_worker, daemon=True).start()
+Thread(target=optimize_db_periodically, daemon=True).start()
+
+def bluesky_worker():
+    """Background loop that cross-posts queued articles to Bluesky"""
+    bluesky = None
+    while True:
+        article = bluesky_queue.get()
+        for attempt in range(BLUESKY_POST_ATTEMPTS):
+            try:
+                if bluesky is None:
+                    from bluesky_integration import BlueskyIntegration, get_bluesky_post_uri_for_article
+                    bluesky = BlueskyIntegration()
+                if get_bluesky_post_uri_for_article(article['path']):
+                    break
+                if bluesky.post_article(
+                    title=article['title'],
+                    content_preview=article['content'][:300],
+                    article_url=f"/articles/{article['path']}",
+                    image_url=article.get('imageUrl'),
+                    article_path=article['path']
+                ):
+                    break
+                # Only retry failures where the post cannot have gone out
+                if not bluesky.retryable:
+                    logging.error(f"❌ Not retrying Bluesky post for '{article['title']}'")
+                    break
+            except Exception as e:
+                logging.warning(f"⚠️ Failed to post to Bluesky: {e}")
+            if attempt + 1 < BLUESKY_POST_ATTEMPTS:
+                time.sleep(2 ** attempt)
+        else:
+            logging.error(f"❌ Giving up posting '{article['title']}' to Bluesky")
+
+Thread(target=bluesky_worker, daemon=True).start()
 
 # Article database functions
 def save_articles_to_db(articles, auto_post_to_bluesky=False):
     """Save or update articles in the database"""
     try:
-        with db_lock:
-            conn = sqlite3.connect(ANALYTICS_DB)
-            cursor = conn.cursor()
-            
+        conn = get_db()
+        updated_at = datetime.now().isoformat()
+        rows = [(
+            article['title'],
+            article['content'],
+            article['tag'],
+            article['repo'],
+            article['path'],
+            article.get('imageUrl'),
+            updated_at
+        ) for article in articles]
+        
+        # Upsert handles both new and existing articles
+        conn.execute('BEGIN IMMEDIATE')
+        existing = set()
+        if auto_post_to_bluesky:
+            # Checked under the write lock so only rows this save inserts get posted
+            existing = {row[0] for row in conn.execute(
+                SQL_SELECT_EXISTING_PATHS,
+                (orjson.dumps([article['path'] for article in articles]).decode(),)
+            )}
+        conn.executemany(SQL_SAVE_ARTICLE, rows)
+        
+        conn.commit()
+        logging.info(f"✅ Saved {len(articles)} articles to database")
+        
+        # Auto-post new articles to Bluesky if enabled; the worker does the
+        # HTTP calls so saving doesn't wait on them
+        if auto_post_to_bluesky:
             for article in articles:
-                # Use INSERT OR REPLACE to handle both new and existing articles
-                cursor.execute('''
-                    INSERT OR REPLACE INTO articles 
-                    (title, content, tag, repo, path, image_url, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    article['title'],
-                    article['content'],
-                    article['tag'],
-                    article['repo'],
-                    article['path'],
-                    article.get('imageUrl'),
-                    datetime.now().isoformat()
-                ))
-            
-            conn.commit()
-            conn.close()
-            logging.info(f"✅ Saved {len(articles)} articles to database")
-            
-            # Auto-post new articles to Bluesky if enabled
-            if auto_post_to_bluesky:
-                try:
-                    bluesky = BlueskyIntegration()
-                    for article in articles:
-                        bluesky.post_article(
-                            title=article['title'],
-                            content_preview=article['content'][:300],
-                            article_url=f"/articles/{article['path']}",
-                            image_url=article.get('imageUrl')
-                        )
-                except Exception as e:
-                    logging.warning(f"⚠️ Failed to post to Bluesky: {e}")
-            
-            return True
+                if article['path'] not in existing:
+                    bluesky_queue.put(article)
+        
+        return True
     except Exception as e:
+        get_db().rollback()
         logging.error(f"❌ Failed to save articles to database: {e}")
         return False
 
 def clear_articles_from_db():
     """Clear all articles from the database"""
     try:
-        with db_lock:
-            conn = sqlite3.connect(ANALYTICS_DB)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM articles')
-            
-            conn.commit()
-            conn.close()
-            logging.info("✅ Cleared all articles from database")
-            return True
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        cursor.execute(SQL_DELETE_ARTICLES)
+        
+        conn.commit()
+        logging.info("✅ Cleared all articles from database")
+        return True
     except Exception as e:
+        get_db().rollback()
         logging.error(f"❌ Failed to clear articles from database: {e}")
         return False
 
 def get_articles_from_db():
     """Retrieve all articles from the database"""
     try:
-        with db_lock:
-            conn = sqlite3.connect(ANALYTICS_DB)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT title, content, tag, repo, path, image_url
-                FROM articles
-                ORDER BY created_at DESC, updated_at DESC
-            ''')
-            
-            articles = []
-            for row in cursor.fetchall():
-                articles.append({
-                    'title': row[0],
-                    'content': row[1],
-                    'tag': row[2],
-                    'repo': row[3],
-                    'path': row[4],
-                    'imageUrl': row[5],
-                    'likes': 0  # Likes are still stored in localStorage for now
-                })
-            
-            conn.close()
-            logging.info(f"✅ Retrieved {len(articles)} articles from database")
-            return articles
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        cursor.execute(SQL_SELECT_ARTICLES)
+        
+        articles = []
+        for row in cursor.fetchall():
+            articles.append({
+                'title': row[0],
+                'content': row[1],
+                'tag': row[2],
+                'repo': row[3],
+                'path': row[4],
+                'imageUrl': row[5],
+                'likes': 0  # Likes are still stored in localStorage for now
+            })
+        
+        logging.info(f"✅ Retrieved {len(articles)} articles from database")
+        return articles
     except Exception as e:
         logging.error(f"❌ Failed to retrieve articles from database: {e}")
         return []
 
+def get_articles_version():
+    """Fingerprint of the articles table that changes whenever articles are written"""
+    try:
+        # Read from the database rather than a counter so writes made by
+        # other worker processes invalidate cached responses too
+        return tuple(get_db().execute(SQL_ARTICLES_VERSION).fetchone())
+    except Exception as e:
+        logging.error(f"❌ Failed to read articles version: {e}")
+        return None
+
+def get_articles_summary(limit=20, snippet_len=500):
+    """Retrieve the most recent articles with content truncated by SQLite"""
+    try:
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        cursor.execute(SQL_SELECT_ARTICLE_SUMMARIES, (snippet_len, limit))
+        
+        articles = [{
+            'title': row[0],
+            'path': row[1],
+            'snippet': row[2]
+        } for row in cursor.fetchall()]
+        
+        return articles
+    except Exception as e:
+        logging.error(f"❌ Failed to retrieve article summaries from database: {e}")
+        return []
+
 def update_article_image_in_db(path, image_url):
     """Update the image URL for a specific article in the database"""
     try:
-        with db_lock:
-            conn = sqlite3.connect(ANALYTICS_DB)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE articles 
-                SET image_url = ?, updated_at = ?
-                WHERE path = ?
-            ''', (image_url, datetime.now().isoformat(), path))
-            
-            conn.commit()
-            conn.close()
-            logging.info(f"✅ Updated image URL for article at path: {path}")
-            return True
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        cursor.execute(SQL_UPDATE_ARTICLE_IMAGE, (image_url, datetime.now().isoformat(), path))
+        
+        conn.commit()
+        logging.info(f"✅ Updated image URL for article at path: {path}")
+        return True
     except Exception as e:
+        get_db().rollback()
         logging.error(f"❌ Failed to update article image in database: {e}")
         return False
 
 # Image cache directory
 IMAGE_CACHE_DIR = 'static/generated_images'
 os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+# Browser cache lifetime for generated images; their names hash the article
+# title (and description), not the image, so a regenerated image keeps its URL
+GENERATED_IMAGE_MAX_AGE = 24 * 60 * 60
+# Names of files known to be in IMAGE_CACHE_DIR, so cache hits skip the stat()
+image_cache_files = set(os.listdir(IMAGE_CACHE_DIR))
+# Basic placeholders are returned inline as data URIs unless this is set,
+# in which case they are written to IMAGE_CACHE_DIR like generated images
+PLACEHOLDER_IMAGES_ON_DISK = os.environ.get('PLACEHOLDER_IMAGES_ON_DISK', 'false').lower() == 'true'
+# Image generation is network-bound, so batches are fanned out over threads
+IMAGE_BATCH_MAX_WORKERS = 8
+# Shared session so image downloads reuse TLS connections to the image host
+image_http = requests.Session()
+image_http.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.5)))
+
+# Configured Gemini model and OpenAI client, rebuilt only when the API key
+# changes so their HTTP connections are kept alive between requests
+_ai_clients = {'gemini_key': None, 'gemini_model': None, 'openai_key': None, 'openai': None}
+# Gemini model names whose calls failed, skipped when picking a model again
+_failed_gemini_models = set()
+_ai_clients_lock = Lock()
 
 # Initialize Gemini API
 def init_gemini():
@@ -258,18 +685,41 @@ def init_gemini():
         logging.info(f"Environment variable check: {'✅ Found' if api_key else '❌ Not found'}")
     
     if api_key:
-        logging.info(f"🔐 API key loaded (starts with: {api_key[:10]}...)")
-        try:
-            genai.configure(api_key=api_key)
-            logging.info("✅ Gemini API configured successfully")
-            return True
-        except Exception as e:
-            logging.error(f"❌ Failed to configure Gemini API: {e}")
-            return False
+        with _ai_clients_lock:
+            if _ai_clients['gemini_key'] == api_key:
+                return True
+            logging.info(f"🔐 API key loaded (starts with: {api_key[:10]}...)")
+            try:
+                genai.configure(api_key=api_key)
+                _ai_clients['gemini_key'] = api_key
+                _ai_clients['gemini_model'] = None
+                _failed_gemini_models.clear()
+                logging.info("✅ Gemini API configured successfully")
+                return True
+            except Exception as e:
+                logging.error(f"❌ Failed to configure Gemini API: {e}")
+                return False
     
     logging.warning("❌ No GEMINI_API_KEY found in config or environment variables")
     return False
 
+def cached_image(prefix, key, ext):
+    """Return the hash, cache file path and URL for an image derived from key"""
+    key_hash = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    filename = f"{prefix}_{key_hash}.{ext}"
+    return key_hash, os.path.join(IMAGE_CACHE_DIR, filename), f"/static/generated_images/{filename}"
+
+def is_image_cached(image_path):
+    """Check whether an image is in the cache directory"""
+    filename = os.path.basename(image_path)
+    if filename in image_cache_files:
+        return True
+    # Another worker process may have written it since startup
+    if os.path.exists(image_path):
+        image_cache_files.add(filename)
+        return True
+    return False
+
 def get_openai_client():
     """Get OpenAI client with API key from config or environment"""
     logging.info("🔑 Starting OpenAI API initialization")
@@ -287,39 +737,88 @@ def get_openai_client():
         logging.info(f"OpenAI environment variable check: {'✅ Found' if api_key else '❌ Not found'}")
     
     if api_key:
-        logging.info(f"🔐 OpenAI API key loaded (starts with: {api_key[:10]}...)")
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            logging.info("✅ OpenAI API configured successfully")
-            return client
-        except Exception as e:
-            logging.error(f"❌ Failed to configure OpenAI API: {e}")
-            return None
+        with _ai_clients_lock:
+            if _ai_clients['openai_key'] == api_key:
+                return _ai_clients['openai']
+            logging.info(f"🔐 OpenAI API key loaded (starts with: {api_key[:10]}...)")
+            try:
+                from openai import OpenAI
+                client = OpenAI(api_key=api_key)
+                _ai_clients['openai_key'] = api_key
+                _ai_clients['openai'] = client
+                logging.info("✅ OpenAI API configured successfully")
+                return client
+            except Exception as e:
+                logging.error(f"❌ Failed to configure OpenAI API: {e}")
+                return None
     
     logging.warning("❌ No OPENAI_API_KEY found in config or environment variables")
     return None
 
+def get_gemini_model():
+    """Get the Gemini model for text generation, creating it once per API key"""
+    with _ai_clients_lock:
+        if _ai_clients['gemini_model']:
+            return _ai_clients['gemini_model']
+        
+        logging.info("🤖 Creating Gemini model for text generation...")
+        
+        # Try different model names that might work (updated for Gemini 2.5)
+        model_names_to_try = [
+            'models/gemini-2.5-flash',
+            'models/gemini-2.5-pro',
+            'gemini-2.5-flash',
+            'gemini-2.5-pro',
+            'models/gemini-1.5-flash',
+            'models/gemini-1.5-pro', 
+            'models/gemini-pro',
+            'gemini-1.5-flash',
+            'gemini-1.5-pro',
+            'gemini-pro'
+        ]
+        
+        for model_name in model_names_to_try:
+            try:
+                logging.info(f"🦪 Trying model: {model_name}")
+                model = genai.GenerativeModel(model_name)
+                if model.model_name in _failed_gemini_models:
+                    continue
+                logging.info(f"✅ Successfully created model: {model_name}")
+                _ai_clients['gemini_model'] = model
+                return model
+            except Exception as e:
+                logging.warning(f"⚠️ Model {model_name} failed: {e}")
+                continue
+        
+        # Every model has failed; start over on the next call in case it was transient
+        _failed_gemini_models.clear()
+        return None
+
+def discard_gemini_model(model):
+    """Drop a cached Gemini model whose calls fail so the next call probes another one"""
+    with _ai_clients_lock:
+        _failed_gemini_models.add(model.model_name)
+        if _ai_clients['gemini_model'] is model:
+            _ai_clients['gemini_model'] = None
+
 def generate_image_with_openai(title, content_preview=""):
     """Generate an actual image using OpenAI DALL-E"""
     logging.info(f"🎨 Starting OpenAI DALL-E image generation for: '{title}'")
     
     try:
+        # Check for a cached image before setting up the client at all
+        _, image_path, image_url = cached_image('dalle', title, 'png')
+        if is_image_cached(image_path):
+            logging.info("♻️ DALL-E image already exists, returning cached version")
+            return image_url
+        
         client = get_openai_client()
         if not client:
             logging.warning("❌ OpenAI API key not configured")
             return None
         
-        # Create a hash for the title to use as filename
-        title_hash = hashlib.md5(title.encode()).hexdigest()
-        image_path = os.path.join(IMAGE_CACHE_DIR, f"dalle_{title_hash}.png")
         logging.info(f"📁 DALL-E image will be saved to: {image_path}")
         
-        # Check if image already exists
-        if os.path.exists(image_path):
-            logging.info("♻️ DALL-E image already exists, returning cached version")
-            return f"/static/generated_images/dalle_{title_hash}.png"
-        
         # Create a prompt for DALL-E
         prompt = f"Create a modern, professional blog post thumbnail image for a tech article titled '{title}'. The image should be visually appealing with a clean, minimal design suitable for a technology blog. Use vibrant colors and modern graphics."
         if content_preview:
@@ -338,19 +837,24 @@ def generate_image_with_openai(title, content_preview=""):
             n=1
         )
         
-        image_url = response.data[0].url
-        logging.info(f"✅ Received DALL-E image URL: {image_url[:50]}...")
+        dalle_url = response.data[0].url
+        logging.info(f"✅ Received DALL-E image URL: {dalle_url[:50]}...")
         
         # Download and save the image
         logging.info("💾 Downloading and saving DALL-E image...")
-        image_response = requests.get(image_url, timeout=30)
-        image_response.raise_for_status()
-        
-        with open(image_path, 'wb') as f:
-            f.write(image_response.content)
+        # Stream into a temp file and rename, so a failed download never
+        # leaves a truncated image behind for the cache check to return
+        tmp_path = image_path + '.part'
+        with image_http.get(dalle_url, timeout=30, stream=True) as image_response:
+            image_response.raise_for_status()
+            with open(tmp_path, 'wb') as f:
+                for chunk in image_response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+        os.replace(tmp_path, image_path)
+        image_cache_files.add(os.path.basename(image_path))
         
         logging.info("✅ DALL-E image downloaded and saved successfully")
-        return f"/static/generated_images/dalle_{title_hash}.png"
+        return image_url
         
     except Exception as e:
         logging.error(f"❌ Failed to generate DALL-E image for '{title}': {e}")
@@ -380,33 +884,7 @@ def generate_article_image(title, content_preview=""):
         logging.info("✅ Gemini API initialized successfully")
         
         # Use Gemini text generation to create image descriptions
-        logging.info("🤖 Creating Gemini model for text generation...")
-        
-        # Try different model names that might work (updated for Gemini 2.5)
-        model_names_to_try = [
-            'models/gemini-2.5-flash',
-            'models/gemini-2.5-pro',
-            'gemini-2.5-flash',
-            'gemini-2.5-pro',
-            'models/gemini-1.5-flash',
-            'models/gemini-1.5-pro', 
-            'models/gemini-pro',
-            'gemini-1.5-flash',
-            'gemini-1.5-pro',
-            'gemini-pro'
-        ]
-        
-        model = None
-        for model_name in model_names_to_try:
-            try:
-                logging.info(f"🦪 Trying model: {model_name}")
-                model = genai.GenerativeModel(model_name)
-                logging.info(f"✅ Successfully created model: {model_name}")
-                break
-            except Exception as e:
-                logging.warning(f"⚠️ Model {model_name} failed: {e}")
-                continue
-        
+        model = get_gemini_model()
         if not model:
             logging.error("❌ Failed to create any Gemini model, using basic placeholder")
             return get_placeholder_image(title)
@@ -423,6 +901,7 @@ def generate_article_image(title, content_preview=""):
             logging.info(f"✅ Received description from Gemini: {description[:100]}...")
         except Exception as e:
             logging.error(f"❌ Failed to call Gemini API: {e}")
+            discard_gemini_model(model)
             return get_placeholder_image(title)
 
         # Create an enhanced placeholder with the AI description
@@ -442,22 +921,13 @@ def generate_article_image(title, content_preview=""):
         logging.error(f"📋 Full traceback: {traceback.format_exc()}")
         return get_placeholder_image(title)
 
-def get_placeholder_image(title):
-    """Generate a simple placeholder image with the article title"""
-    try:
-        title_hash = hashlib.md5(title.encode()).hexdigest()
-        image_path = os.path.join(IMAGE_CACHE_DIR, f"placeholder_{title_hash}.svg")
-        
-        # Check if placeholder already exists
-        if os.path.exists(image_path):
-            return f"/static/generated_images/placeholder_{title_hash}.svg"
-        
-        # Create a simple SVG placeholder
-        # Generate a color based on the title hash
-        color_hash = int(title_hash[:6], 16)
-        hue = color_hash % 360
-        
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+def render_placeholder_svg(title, title_hash):
+    """Render the simple gradient placeholder SVG for an article title"""
+    # Generate a color based on the title hash
+    color_hash = int(title_hash[:6], 16)
+    hue = color_hash % 360
+    
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="400" height="200" xmlns="http://www.w3.org/2000/svg">
   <defs>
     <linearGradient id="grad1" x1="0%" y1="0%" x2="100%" y2="100%">
@@ -471,80 +941,57 @@ def get_placeholder_image(title):
     {title[:50]}{'...' if len(title) > 50 else ''}
   </text>
 </svg>'''
+
+@lru_cache(maxsize=2048)
+def placeholder_data_uri(title):
+    """Inline data: URI of the placeholder for a title, memoized across rescans"""
+    title_hash = hashlib.blake2b(title.encode(), digest_size=16).hexdigest()
+    svg_content = render_placeholder_svg(title, title_hash)
+    return 'data:image/svg+xml;base64,' + base64.b64encode(svg_content.encode('utf-8')).decode('ascii')
+
+def get_placeholder_image(title):
+    """Generate a simple placeholder image with the article title"""
+    try:
+        # The SVG is tiny, so hand it back inline instead of storing a file
+        # the browser then has to fetch separately
+        if not PLACEHOLDER_IMAGES_ON_DISK:
+            return placeholder_data_uri(title)
+        
+        title_hash, image_path, image_url = cached_image('placeholder', title, 'svg')
+        
+        # Check if placeholder already exists
+        if is_image_cached(image_path):
+            return image_url
         
         # Save the SVG file
         with open(image_path, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
+            f.write(render_placeholder_svg(title, title_hash))
+        image_cache_files.add(os.path.basename(image_path))
         
-        return f"/static/generated_images/placeholder_{title_hash}.svg"
+        return image_url
         
     except Exception as e:
         print(f"Error creating placeholder image for '{title}': {e}")
         return None
 
-def create_enhanced_placeholder(title, ai_description):
-    """Create an enhanced placeholder with AI-generated description elements"""
-    try:
-        title_hash = hashlib.md5((title + ai_description).encode()).hexdigest()
-        image_path = os.path.join(IMAGE_CACHE_DIR, f"enhanced_{title_hash}.svg")
-        
-        # Check if enhanced placeholder already exists
-        if os.path.exists(image_path):
-            return f"/static/generated_images/enhanced_{title_hash}.svg"
-        
-        # Extract color themes from AI description (simple keyword matching)
-        description_lower = ai_description.lower()
-        
-        # Default colors
-        primary_hue = int(title_hash[:3], 16) % 360
-        secondary_hue = (primary_hue + 120) % 360
-        
-        # Adjust colors based on description keywords
-        if 'blue' in description_lower or 'ocean' in description_lower or 'sky' in description_lower:
-            primary_hue = 210
-        elif 'green' in description_lower or 'nature' in description_lower or 'forest' in description_lower:
-            primary_hue = 120
-        elif 'red' in description_lower or 'fire' in description_lower or 'energy' in description_lower:
-            primary_hue = 0
-        elif 'purple' in description_lower or 'violet' in description_lower:
-            primary_hue = 270
-        elif 'orange' in description_lower or 'sunset' in description_lower:
-            primary_hue = 30
-        
-        # Adjust saturation and lightness based on description mood
-        saturation = 70
-        lightness = 50
-        
-        if 'bright' in description_lower or 'vibrant' in description_lower:
-            saturation = 85
-        elif 'dark' in description_lower or 'shadow' in description_lower:
-            lightness = 30
-        elif 'light' in description_lower or 'soft' in description_lower:
-            lightness = 70
-            saturation = 50
-        
-        # Create more sophisticated SVG with patterns
-        pattern_elements = ''
-        if 'tech' in description_lower or 'digital' in description_lower or 'code' in description_lower:
-            pattern_elements = f'''
+# Templates for AI-enhanced placeholders, filled in with str.format_map
+ENHANCED_TECH_PATTERN = '''
             <circle cx="350" cy="50" r="30" fill="hsla({primary_hue}, 50%, 80%, 0.3)" />
             <rect x="320" y="30" width="60" height="40" fill="none" stroke="hsla({primary_hue}, 50%, 80%, 0.5)" stroke-width="2" rx="5" />
             <path d="M30 150 Q50 130 70 150 T110 150" fill="none" stroke="hsla({secondary_hue}, 60%, 70%, 0.4)" stroke-width="3" />
             '''
-        elif 'abstract' in description_lower or 'geometric' in description_lower:
-            pattern_elements = f'''
+ENHANCED_GEOMETRIC_PATTERN = '''
             <polygon points="50,50 80,30 110,50 80,70" fill="hsla({primary_hue}, 60%, 70%, 0.4)" />
             <circle cx="320" cy="160" r="25" fill="hsla({secondary_hue}, 50%, 60%, 0.3)" />
             <rect x="300" y="50" width="40" height="40" fill="hsla({primary_hue}, 40%, 80%, 0.3)" transform="rotate(45 320 70)" />
             '''
-        
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+ENHANCED_SVG_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="400" height="200" xmlns="http://www.w3.org/2000/svg">
   <defs>
     <linearGradient id="mainGrad" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:hsl({primary_hue}, {saturation}%, {lightness + 10}%);stop-opacity:1" />
-      <stop offset="50%" style="stop-color:hsl({secondary_hue}, {saturation - 10}%, {lightness}%);stop-opacity:1" />
-      <stop offset="100%" style="stop-color:hsl({primary_hue}, {saturation}%, {lightness - 10}%);stop-opacity:1" />
+      <stop offset="0%" style="stop-color:hsl({primary_hue}, {saturation}%, {lightness_high}%);stop-opacity:1" />
+      <stop offset="50%" style="stop-color:hsl({secondary_hue}, {saturation_low}%, {lightness}%);stop-opacity:1" />
+      <stop offset="100%" style="stop-color:hsl({primary_hue}, {saturation}%, {lightness_low}%);stop-opacity:1" />
     </linearGradient>
     <radialGradient id="overlayGrad" cx="50%" cy="50%" r="50%">
       <stop offset="0%" style="stop-color:rgba(255,255,255,0.2);stop-opacity:1" />
@@ -556,26 +1003,123 @@ def create_enhanced_placeholder(title, ai_description):
   {pattern_elements}
   <rect x="20" y="20" width="360" height="160" fill="rgba(255,255,255,0.1)" stroke="rgba(255,255,255,0.3)" stroke-width="1" rx="10" />
   <text x="200" y="95" font-family="Arial, sans-serif" font-size="18" font-weight="bold" text-anchor="middle" fill="white" opacity="0.95">
-    {title[:45]}{'...' if len(title) > 45 else ''}
+    {title}
   </text>
   <text x="200" y="125" font-family="Arial, sans-serif" font-size="11" text-anchor="middle" fill="rgba(255,255,255,0.7)">
     AI-Enhanced
   </text>
 </svg>'''
+
+# Keyword tables matched in order against the AI description; the first hit wins
+ENHANCED_HUE_KEYWORDS = (
+    (('blue', 'ocean', 'sky'), 210),
+    (('green', 'nature', 'forest'), 120),
+    (('red', 'fire', 'energy'), 0),
+    (('purple', 'violet'), 270),
+    (('orange', 'sunset'), 30),
+)
+# (saturation, lightness) for the description's mood
+ENHANCED_MOOD_KEYWORDS = (
+    (('bright', 'vibrant'), (85, 50)),
+    (('dark', 'shadow'), (70, 30)),
+    (('light', 'soft'), (50, 70)),
+)
+ENHANCED_PATTERN_KEYWORDS = (
+    (('tech', 'digital', 'code'), ENHANCED_TECH_PATTERN),
+    (('abstract', 'geometric'), ENHANCED_GEOMETRIC_PATTERN),
+)
+
+def match_keywords(text, table, default):
+    """Return the value of the first table entry with a keyword found in text"""
+    for keywords, value in table:
+        if any(keyword in text for keyword in keywords):
+            return value
+    return default
+
+def create_enhanced_placeholder(title, ai_description):
+    """Create an enhanced placeholder with AI-generated description elements"""
+    try:
+        title_hash, image_path, image_url = cached_image('enhanced', title + ai_description, 'svg')
+        
+        # Check if enhanced placeholder already exists
+        if is_image_cached(image_path):
+            return image_url
+        
+        # Extract color themes from AI description (simple keyword matching)
+        description_lower = ai_description.lower()
+        
+        # Default hue comes from the hash, secondary hue is always derived from it
+        primary_hue = int(title_hash[:3], 16) % 360
+        secondary_hue = (primary_hue + 120) % 360
+        primary_hue = match_keywords(description_lower, ENHANCED_HUE_KEYWORDS, primary_hue)
+        saturation, lightness = match_keywords(description_lower, ENHANCED_MOOD_KEYWORDS, (70, 50))
+        
+        hues = {'primary_hue': primary_hue, 'secondary_hue': secondary_hue}
+        pattern_elements = match_keywords(description_lower, ENHANCED_PATTERN_KEYWORDS, '').format_map(hues)
+        
+        svg_content = ENHANCED_SVG_TEMPLATE.format_map({
+            **hues,
+            'saturation': saturation,
+            'saturation_low': saturation - 10,
+            'lightness': lightness,
+            'lightness_high': lightness + 10,
+            'lightness_low': lightness - 10,
+            'pattern_elements': pattern_elements,
+            'title': title[:45] + ('...' if len(title) > 45 else '')
+        })
         
         # Save the enhanced SVG file
-        with open(image_path, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
+        with open(image_path, 'wb') as f:
+            f.write(svg_content.encode('utf-8'))
+        image_cache_files.add(os.path.basename(image_path))
         
         logging.info(f"Created enhanced placeholder with themes from: {ai_description[:50]}...")
-        return f"/static/generated_images/enhanced_{title_hash}.svg"
+        return image_url
         
     except Exception as e:
         logging.error(f"Error creating enhanced placeholder for '{title}': {e}")
         return None
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib json module"""
+    # Mirror Flask's DefaultJSONProvider settings so output stays the same
+    sort_keys = True
+    compact = None
+    mimetype = 'application/json'
+
+    # Types orjson can't handle (Decimal, ...) fall back to Flask's default
+    # hook; datetimes are passed through to it too so they stay HTTP dates
+    default = staticmethod(DefaultJSONProvider.default)
+
+    def _options(self, sort_keys, indent):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        option = self._options(kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent'))
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys, indent)),
+            mimetype=self.mimetype
+        )
+
 # Initialize the Flask application
 app = Flask(__name__, static_folder='static')
+app.json = OrjsonProvider(app)
+# API clients don't need pretty-printed or key-sorted JSON
+app.json.compact = True
+app.json.sort_keys = False
 
 # Configure for reverse proxy (HAProxy/nginx with HTTPS)
 app.wsgi_app = ProxyFix(
@@ -599,13 +1143,38 @@ app.config.update(
     PERMANENT_SESSION_LIFETIME=timedelta(hours=24)
 )
 
+@app.after_request
+def cache_generated_images(response):
+    """Let browsers cache generated images for a day before revalidating"""
+    if request.path.startswith('/static/generated_images/') and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = GENERATED_IMAGE_MAX_AGE
+    return response
+
 
 # Configuration management functions
+
+# Parsed config.json, reused until the file's mtime or size changes. Kept
+# as one (key, data) tuple that is only ever replaced whole, so a reader
+# never pairs a new key with old data
+_config_cache = (None, None)
+
+def _config_cache_key(st):
+    return (st.st_mtime_ns, st.st_size)
+
 def load_config():
     """Load configuration from JSON file"""
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
+        global _config_cache
+        key = _config_cache_key(os.stat(CONFIG_FILE))
+        cached_key, cached_data = _config_cache
+        if key == cached_key:
+            return cached_data
+
+        with open(CONFIG_FILE, 'rb') as f:
+            key = _config_cache_key(os.fstat(f.fileno()))
+            config = orjson.loads(f.read())
             
         # Validate required fields
         required_fields = ['blog_name', 'admin_username', 'admin_password_hash', 'repositories']
@@ -614,6 +1183,7 @@ def load_config():
                 print(f"Missing required field '{field}' in config.json")
                 return None
                 
+        _config_cache = (key, config)
         return config
         
     except FileNotFoundError:
@@ -622,7 +1192,7 @@ def load_config():
         default_config = {
             "blog_name": "My Blog",
             "admin_username": "admin",
-            "admin_password_hash": generate_password_hash(DEFAULT_PASSWORD),
+            "admin_password_hash": generate_password_hash(DEFAULT_PASSWORD, method=PASSWORD_HASH_METHOD),
             "repositories": [],
             "session_timeout_hours": 24
         }
@@ -631,7 +1201,7 @@ def load_config():
         else:
             return None
             
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing config.json: {e}")
         return None
         
@@ -641,13 +1211,59 @@ def load_config():
 
 def save_config(config):
     """Save configuration to JSON file"""
+    global _config_cache
+    tmp_path = None
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Write to a temp file and rename over the original so readers never
+        # see a partially written config
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(CONFIG_FILE)), prefix='.config-', suffix='.tmp'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_FILE)
+        tmp_path = None
+        # Keep the cache warm so the next load_config() skips the disk read
+        _config_cache = (_config_cache_key(os.stat(CONFIG_FILE)), config)
         return True
     except Exception as e:
+        _config_cache = (None, None)
         print(f"Error saving config: {e}")
         return False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def session_expired():
+    """Check whether the current admin session is past its timeout"""
+    expires_at = session.get('expires_at')
+    if expires_at is None:
+        # Sessions from before expires_at was stamped carry an ISO login_time
+        login_time = session.get('login_time')
+        config = load_config()
+        if not login_time or not config:
+            return False
+        timeout_hours = config.get('session_timeout_hours', 24)
+        expires_at = datetime.fromisoformat(login_time).timestamp() + timeout_hours * 3600
+    return time.time() > expires_at
+
+def password_attempts_exceeded():
+    """Record a password check for the client IP, True when it is over the limit"""
+    now = time.monotonic()
+    with _password_attempts_lock:
+        attempts = _password_attempts[request.remote_addr]
+        while attempts and attempts[0] <= now - PASSWORD_ATTEMPT_WINDOW:
+            attempts.popleft()
+        if len(attempts) >= PASSWORD_ATTEMPT_LIMIT:
+            return True
+        attempts.append(now)
+        # Drop idle clients so the table only holds recent addresses
+        if len(_password_attempts) > 1000:
+            for ip in [ip for ip, times in _password_attempts.items() if times[-1] <= now - PASSWORD_ATTEMPT_WINDOW]:
+                del _password_attempts[ip]
+        return False
 
 def require_auth(f):
     """Decorator to require authentication for admin endpoints"""
@@ -657,26 +1273,36 @@ def require_auth(f):
             return jsonify({'error': 'Authentication required'}), 401
         
         # Check session timeout
-        config = load_config()
-        if not config:
-            return jsonify({'error': 'Configuration error'}), 500
-            
-        login_time = session.get('login_time')
-        if login_time:
-            login_datetime = datetime.fromisoformat(login_time)
-            timeout_hours = config.get('session_timeout_hours', 24)
-            if datetime.now() - login_datetime > timedelta(hours=timeout_hours):
-                session.clear()
-                return jsonify({'error': 'Session expired'}), 401
+        if session_expired():
+            session.clear()
+            return jsonify({'error': 'Session expired'}), 401
         
         return f(*args, **kwargs)
     return decorated_function
 
+# Serialized article list and its ETag as one (key, body, etag) tuple keyed
+# by get_articles_version(), replaced whole so readers never mix versions
+_articles_cache = (None, None, None)
+
 # API Route to get articles
 @app.route('/api/articles', methods=['GET'])
 def get_articles():
-    articles = get_articles_from_db()
-    return jsonify(articles)
+    global _articles_cache
+    key = get_articles_version()
+    cached_key, body, etag = _articles_cache
+    if key is None or key != cached_key:
+        articles = get_articles_from_db()
+        body = app.json.dumps(articles).encode('utf-8')
+        if key is None:
+            return Response(body, mimetype='application/json')
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        _articles_cache = (key, body, etag)
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Articles change on rescans, so browsers must revalidate each time
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 # API Route to save articles
 @app.route('/api/save-articles', methods=['POST'])
@@ -722,15 +1348,26 @@ def login():
     username = data['username']
     password = data['password']
     
+    if password_attempts_exceeded():
+        return jsonify({'error': 'Too many login attempts, try again later'}), 429
+    
     if (username == config['admin_username'] and 
         check_password_hash(config['admin_password_hash'], password)):
         
+        # Upgrade hashes made with an older method while the plain password is at hand
+        if not config['admin_password_hash'].startswith(f"{PASSWORD_HASH_METHOD}:"):
+            config['admin_password_hash'] = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+            save_config(config)
+        
+        login_time = time.time()
         session['authenticated'] = True
-        session['login_time'] = datetime.now().isoformat()
+        session['login_time'] = login_time
+        session['expires_at'] = login_time + config.get('session_timeout_hours', 24) * 3600
         session.permanent = True
         
-        # Check if using default password
-        is_default_password = check_password_hash(config['admin_password_hash'], DEFAULT_PASSWORD)
+        # The submitted password was just verified, so compare it directly
+        # instead of running the password hash a second time
+        is_default_password = password == DEFAULT_PASSWORD
         
         return jsonify({
             'success': True,
@@ -826,6 +1463,9 @@ def change_password():
     if not config:
         return jsonify({'error': 'Configuration error'}), 500
     
+    if password_attempts_exceeded():
+        return jsonify({'error': 'Too many attempts, try again later'}), 429
+    
     # Verify current password
     if not check_password_hash(config['admin_password_hash'], data['current_password']):
         return jsonify({'error': 'Current password is incorrect'}), 400
@@ -836,7 +1476,7 @@ def change_password():
         return jsonify({'error': 'New password must be at least 6 characters'}), 400
     
     # Update password
-    config['admin_password_hash'] = generate_password_hash(new_password)
+    config['admin_password_hash'] = generate_password_hash(new_password, method=PASSWORD_HASH_METHOD)
     
     if save_config(config):
         return jsonify({'success': True})
@@ -847,11 +1487,7 @@ def change_password():
 @require_auth
 def set_gemini_api_key():
     """Set Gemini API key"""
-    logging.info("🔑 SET GEMINI API KEY ENDPOINT CALLED")
-    
     data = request.get_json()
-    logging.info(f"📋 Request data received: {bool(data and data.get('api_key'))}")
-    
     if not data or not data.get('api_key'):
         logging.error("❌ No API key provided in request")
         return jsonify({'error': 'API key required'}), 400
@@ -862,7 +1498,7 @@ def set_gemini_api_key():
         return jsonify({'error': 'Configuration error'}), 500
     
     api_key = data['api_key'].strip()
-    logging.info(f"🔐 API key received (length: {len(api_key)}, starts with: {api_key[:10]}...)")
+    logging.debug("🔐 API key received (length: %d)", len(api_key))
     
     if len(api_key) < 10:  # Basic validation
         logging.error("❌ API key too short")
@@ -870,7 +1506,6 @@ def set_gemini_api_key():
     
     # Update API key
     config['gemini_api_key'] = api_key
-    logging.info("💾 Attempting to save config with API key...")
     
     if save_config(config):
         logging.info("✅ Config saved successfully with Gemini API key")
@@ -883,11 +1518,7 @@ def set_gemini_api_key():
 @require_auth
 def set_openai_api_key():
     """Set OpenAI API key"""
-    logging.info("🔑 SET OPENAI API KEY ENDPOINT CALLED")
-    
     data = request.get_json()
-    logging.info(f"📋 Request data received: {bool(data and data.get('api_key'))}")
-    
     if not data or not data.get('api_key'):
         logging.error("❌ No API key provided in request")
         return jsonify({'error': 'API key required'}), 400
@@ -898,7 +1529,7 @@ def set_openai_api_key():
         return jsonify({'error': 'Configuration error'}), 500
     
     api_key = data['api_key'].strip()
-    logging.info(f"🔐 OpenAI API key received (length: {len(api_key)}, starts with: {api_key[:10]}...)")
+    logging.debug("🔐 OpenAI API key received (length: %d)", len(api_key))
     
     if len(api_key) < 10:  # Basic validation
         logging.error("❌ API key too short")
@@ -906,7 +1537,6 @@ def set_openai_api_key():
     
     # Update API key
     config['openai_api_key'] = api_key
-    logging.info("💾 Attempting to save config with OpenAI API key...")
     
     if save_config(config):
         logging.info("✅ Config saved successfully with OpenAI API key")
@@ -923,7 +1553,15 @@ def get_repositories():
     if not config:
         return jsonify({'error': 'Configuration error'}), 500
     
-    return jsonify({'repositories': config.get('repositories', [])})
+    response = jsonify({'repositories': config.get('repositories', [])})
+    key, cached = _config_cache
+    if key is not None and cached is config:
+        # Tagged by the config file's mtime and size, so admin views revalidate cheaply
+        response.set_etag('%x-%x' % key)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    return response
 
 @app.route('/api/repositories', methods=['POST'])
 @require_auth
@@ -972,6 +1610,10 @@ def remove_repository(index):
     else:
         return jsonify({'error': 'Invalid repository index'}), 400
 
+# Serialized public config and its ETag as one (key, body, etag) tuple,
+# rebuilt whenever the config cache key changes
+_public_config_cache = (None, None, None)
+
 @app.route('/api/public/config', methods=['GET'])
 def get_public_config():
     """Get public configuration (blog name and repositories) without authentication"""
@@ -983,31 +1625,37 @@ def get_public_config():
             'repositories': []
         })
     
-    # Return only public information
-    public_config = {
-        'blog_name': config.get('blog_name', 'My Blog'),
-        'repositories': config.get('repositories', []),
-        'public_base_url': config.get('public_base_url', '')
-    }
-    return jsonify(public_config)
+    global _public_config_cache
+    key, cached = _config_cache
+    if cached is not config:
+        key = None
+    cached_key, body, etag = _public_config_cache
+    if key is None or cached_key != key:
+        # Return only public information
+        public_config = {
+            'blog_name': config.get('blog_name', 'My Blog'),
+            'repositories': config.get('repositories', []),
+            'public_base_url': config.get('public_base_url', '')
+        }
+        body = app.json.dumps(public_config).encode('utf-8')
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        _public_config_cache = (key, body, etag)
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response.make_conditional(request)
 
 @app.route('/api/auth/status', methods=['GET'])
 def auth_status():
     """Check authentication status"""
     is_authenticated = session.get('authenticated', False)
     
-    if is_authenticated:
-        # Check if session is still valid
-        config = load_config()
-        login_time = session.get('login_time')
-        
-        if config and login_time:
-            login_datetime = datetime.fromisoformat(login_time)
-            timeout_hours = config.get('session_timeout_hours', 24)
-            
-            if datetime.now() - login_datetime > timedelta(hours=timeout_hours):
-                session.clear()
-                is_authenticated = False
+    # Check if session is still valid
+    if is_authenticated and session_expired():
+        session.clear()
+        is_authenticated = False
     
     return jsonify({'authenticated': is_authenticated})
 
@@ -1016,71 +1664,23 @@ def auth_status():
 @require_auth
 def get_analytics_stats():
     """Get comprehensive analytics statistics"""
+    if time.monotonic() < _stats_cache['expires_at']:
+        return Response(_stats_cache['body'], mimetype='application/json')
     try:
-        with db_lock:
-            conn = sqlite3.connect(ANALYTICS_DB)
-            cursor = conn.cursor()
-            
-            # Total hits
-            cursor.execute('SELECT COUNT(*) FROM analytics')
-            total_hits = cursor.fetchone()[0]
-            
-            # Unique visitors (based on IP)
-            cursor.execute('SELECT COUNT(DISTINCT ip_address) FROM analytics')
-            unique_visitors = cursor.fetchone()[0]
-            
-            # Top 10 articles
-            cursor.execute('''
-                SELECT article, COUNT(*) as views, 
-                       GROUP_CONCAT(DISTINCT country) as countries
-                FROM analytics 
-                WHERE article IS NOT NULL AND article != ''
-                GROUP BY article 
-                ORDER BY views DESC 
-                LIMIT 10
-            ''')
-            top_articles = [{
-                'article': row[0],
-                'views': row[1],
-                'countries': row[2].split(',') if row[2] else []
-            } for row in cursor.fetchall()]
-            
-            # Top 10 countries
-            cursor.execute('''
-                SELECT country, COUNT(*) as visits
-                FROM analytics 
-                WHERE country != 'Unknown'
-                GROUP BY country 
-                ORDER BY visits DESC 
-                LIMIT 10
-            ''')
-            top_countries = [{
-                'country': row[0],
-                'visits': row[1]
-            } for row in cursor.fetchall()]
-            
-            # Recent activity (last 30 days by day)
-            cursor.execute('''
-                SELECT DATE(timestamp) as date, COUNT(*) as visits
-                FROM analytics 
-                WHERE timestamp >= datetime('now', '-30 days')
-                GROUP BY DATE(timestamp)
-                ORDER BY date DESC
-            ''')
-            daily_stats = [{
-                'date': row[0],
-                'visits': row[1]
-            } for row in cursor.fetchall()]
-            
-            conn.close()
-            
-            return jsonify({
-                'total_hits': total_hits,
-                'unique_visitors': unique_visitors,
-                'top_articles': top_articles,
-                'top_countries': top_countries,
-                'daily_stats': daily_stats
-            })
+        row = get_db().execute(SQL_ANALYTICS_STATS).fetchone()
+        total_hits, unique_visitors = row[0], row[1]
+        top_articles, top_countries, daily_stats = (orjson.loads(value) for value in row[2:])
+        
+        body = app.json.dumps({
+            'total_hits': total_hits,
+            'unique_visitors': unique_visitors,
+            'top_articles': top_articles,
+            'top_countries': top_countries,
+            'daily_stats': daily_stats
+        }).encode('utf-8')
+        _stats_cache['body'] = body
+        _stats_cache['expires_at'] = time.monotonic() + ANALYTICS_STATS_TTL
+        return Response(body, mimetype='application/json')
             
     except Exception as e:
         print(f"Error getting analytics: {e}")
@@ -1101,13 +1701,7 @@ def track_article_visit():
 @require_auth
 def generate_image_endpoint():
     """Generate an image for a blog post"""
-    logging.info("\n" + "="*50)
-    logging.info("🔥 GENERATE IMAGE ENDPOINT CALLED 🔥")
-    logging.info("🔥 THIS IS THE NEW CODE WITH ENHANCED LOGGING 🔥")
-    logging.info("="*50 + "\n")
-    
     data = request.get_json()
-    logging.info(f"📋 Request data: {data}")
     
     if not data or not data.get('title'):
         logging.error("❌ ERROR: No title provided in request")
@@ -1118,17 +1712,15 @@ def generate_image_endpoint():
     logging.info(f"🎯 Generating image for title: '{title}'")
     
     # Try to generate with Gemini first, fall back to placeholder
-    logging.info("📞 Calling generate_article_image function...")
     image_url = generate_article_image(title, content_preview)
-    logging.info(f"↩️ generate_article_image returned: {image_url}")
+    logging.debug("↩️ generate_article_image returned: %s", image_url)
     
     if not image_url:
         logging.warning("⚠️ Gemini generation failed, falling back to placeholder...")
         image_url = get_placeholder_image(title)
-        logging.info(f"🔄 Placeholder image URL: {image_url}")
+        logging.debug("🔄 Placeholder image URL: %.200s", image_url)
     
     if image_url:
-        logging.info(f"✅ Returning success with image_url: {image_url}")
         return jsonify({'success': True, 'image_url': image_url})
     else:
         logging.error("❌ ERROR: Both Gemini and placeholder generation failed")
@@ -1142,13 +1734,9 @@ def generate_images_batch():
     if not data or not data.get('articles'):
         return jsonify({'error': 'Articles array required'}), 400
     
-    articles = data['articles']
-    results = []
+    articles = [article for article in data['articles'] if article.get('title')]
     
-    for article in articles:
-        if not article.get('title'):
-            continue
-            
+    def process_article(article):
         title = article['title']
         content_preview = article.get('content', '')
         
@@ -1157,12 +1745,18 @@ def generate_images_batch():
         if not image_url:
             image_url = get_placeholder_image(title)
         
-        results.append({
+        return {
             'title': title,
             'image_url': image_url,
             'path': article.get('path', ''),
             'success': image_url is not None
-        })
+        }
+    
+    results = []
+    if articles:
+        # map() keeps results in the same order as the submitted articles
+        with ThreadPoolExecutor(max_workers=min(IMAGE_BATCH_MAX_WORKERS, len(articles))) as executor:
+            results = list(executor.map(process_article, articles))
     
     return jsonify({'success': True, 'results': results})
 
@@ -1173,7 +1767,9 @@ def index():
     """
     # Track homepage visit
     track_visit('homepage')
-    return render_template('index.html')
+    # The page has no template variables, so skip Jinja and send the file
+    # directly; this also gives browsers ETag/Last-Modified revalidation
+    return send_from_directory(os.path.join(app.root_path, app.template_folder), 'index.html')
 
 # Setup Bluesky integration
 try:
@@ -1183,12 +1779,9 @@ try:
 except ImportError as e:
     print(f"⚠️ Bluesky integration not available: {e}")
 
-print("🚀 FLASK APP STARTING WITH NEW CODE - VERSION 2.0 🚀")
-print("🔧 Debug mode enabled, image generation configured")
-
 if __name__ == '__main__':
-    # Runs the app on a local development server.
-    # Debug=True allows for automatic reloading when changes are made.
+    # Runs the app on a local development server; use gunicorn in production
+    # (see README). FLASK_DEBUG=1 enables the debugger and auto-reloading.
     # host='0.0.0.0' makes it accessible from any IP address
-    # port=5055 sets the specific port
-    app.run(host='0.0.0.0', port=5057, debug=True)
+    # port=5057 sets the specific port
+    app.run(host='0.0.0.0', port=5057, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -2,50 +2,363 @@
 Bluesky integration for SimpleBlog
 Handles cross-posting and fetching engagement data from Bluesky
 """
+import base64
 import requests
-import json
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
+import orjson
 import logging
+import os
 import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+CONFIG_FILE = 'config.json'
+
+# Longest we will sleep for an exhausted Bluesky rate-limit window before
+# sending anyway and letting the 429 surface
+BLUESKY_MAX_RATE_WAIT = 30
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that honours Bluesky's RateLimit-Remaining/RateLimit-Reset headers per endpoint"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # path -> epoch seconds when its exhausted window resets
+        self._exhausted_until = {}
+
+    def send(self, request, **kwargs):
+        path = urlparse(request.url).path
+        wait = self._exhausted_until.get(path, 0) - time.time()
+        if wait > 0:
+            time.sleep(min(wait, BLUESKY_MAX_RATE_WAIT))
+        response = super().send(request, **kwargs)
+        remaining = response.headers.get('RateLimit-Remaining')
+        if remaining is not None:
+            try:
+                if int(remaining) <= 0:
+                    self._exhausted_until[path] = float(response.headers.get('RateLimit-Reset', 0))
+                else:
+                    self._exhausted_until.pop(path, None)
+            except ValueError:
+                pass
+        return response
+
+# Shared across BlueskyIntegration instances so posts and stats lookups reuse
+# keep-alive connections to bsky.social. Reads are retried with backoff on 429
+# and gateway errors; posts are retried by the caller instead, since a retried
+# createRecord after a 5xx could publish twice
+bluesky_http = requests.Session()
+bluesky_http.headers.update({'User-Agent': 'SimpleBlog/2.0'})
+bluesky_http.mount('https://', RateLimitedAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset({'GET'}), raise_on_status=False)
+))
+# (connect, read) timeout for XRPC calls, so a stalled bsky.social can't hang a worker
+BLUESKY_TIMEOUT = (3.05, 15)
+
+# createSession result shared across instances, keyed by (handle, app password).
+# It is reused until its access token is within BLUESKY_SESSION_MARGIN seconds
+# of the JWT's exp claim (or BLUESKY_SESSION_TTL when exp can't be read), then
+# renewed with its refreshJwt instead of logging in again
+BLUESKY_SESSION_TTL = 90 * 60
+BLUESKY_SESSION_MARGIN = 60
+_auth_cache = {'key': None, 'session': None, 'expires_at': 0}
+_auth_lock = threading.Lock()
+# Tokens are also saved here so restarts and other worker processes skip
+# createSession, which Bluesky rate-limits tightly
+BLUESKY_SESSION_FILE = '.bluesky_session.json'
+
+def session_expiry(session):
+    """Epoch seconds when a session's access token expires, from its JWT exp claim"""
+    try:
+        payload = session['accessJwt'].split('.')[1]
+        return orjson.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['exp']
+    except Exception:
+        return time.time() + BLUESKY_SESSION_TTL
+
+def load_saved_session(handle):
+    """Session saved by save_session for this handle, or None"""
+    try:
+        with open(BLUESKY_SESSION_FILE, 'rb') as f:
+            saved = orjson.loads(f.read())
+        if saved.get('handle') == handle:
+            return saved['session']
+    except (FileNotFoundError, orjson.JSONDecodeError, KeyError, AttributeError):
+        pass
+    return None
+
+def save_session(handle, session):
+    """Persist a session's tokens, readable only by the blog's user"""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(BLUESKY_SESSION_FILE)), prefix='.bluesky-', suffix='.tmp'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({'handle': handle, 'session': session}))
+        os.replace(tmp_path, BLUESKY_SESSION_FILE)
+        tmp_path = None
+    except Exception as e:
+        logging.warning(f"⚠️ Could not save Bluesky session: {e}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# Hashtags appended to every post: the previous defaults merged with the
+# example set, deduplicated in order
+DEFAULT_HASHTAGS = ["#daveknowstech", "#blog", "#blogpost", "#tech", "#techblog"]
+EXAMPLE_HASHTAGS = ["#vibecode", "#ai", "#ssh", "#tech", "#ssh", "#daveknowstech"]
+POST_HASHTAGS = tuple(dict.fromkeys(DEFAULT_HASHTAGS + EXAMPLE_HASHTAGS))
+POST_HASHTAGS_LINE = " ".join(POST_HASHTAGS)
+
+# #tag sequences in a composed post, annotated as hashtag facets
+HASHTAG_RE = re.compile(r"(?<!\w)#([A-Za-z0-9_]+)")
+
+# Most posts app.bsky.feed.getPosts returns per request
+GET_POSTS_BATCH_SIZE = 25
+# getPosts requests run concurrently when a lookup spans several batches
+GET_POSTS_MAX_WORKERS = 4
+# Most article paths one unauthenticated stats-batch request may ask about
+STATS_BATCH_MAX_PATHS = 100
+
+# uploadBlob rejects images larger than this
+BLUESKY_MAX_IMAGE_BYTES = 1_000_000
+
+# Parsed config.json, reused until the file's mtime or size changes. Kept
+# as one (key, data) tuple that is only ever replaced whole, so a reader
+# never pairs a new key with old data
+_config_cache = (None, None)
+
+def _config_cache_key(st):
+    return (st.st_mtime_ns, st.st_size)
+
+def load_config():
+    """Load configuration from JSON file"""
+    try:
+        global _config_cache
+        key = _config_cache_key(os.stat(CONFIG_FILE))
+        cached_key, cached_data = _config_cache
+        if key == cached_key:
+            return cached_data
+        with open(CONFIG_FILE, 'rb') as f:
+            key = _config_cache_key(os.fstat(f.fileno()))
+            config = orjson.loads(f.read())
+        _config_cache = (key, config)
+        return config
+    except FileNotFoundError:
+        return None
+    except orjson.JSONDecodeError:
+        return None
+
+def save_config(config):
+    """Save configuration to JSON file"""
+    global _config_cache
+    tmp_path = None
+    try:
+        # Write to a temp file and rename over the original so app.py and
+        # other workers never read a partially written config
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(CONFIG_FILE)), prefix='.config-', suffix='.tmp'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_FILE)
+        tmp_path = None
+        # Keep the cache warm so the next load_config() skips the disk read
+        _config_cache = (_config_cache_key(os.stat(CONFIG_FILE)), config)
+        return True
+    except Exception as e:
+        _config_cache = (None, None)
+        logging.error(f"Error saving config: {e}")
+        return False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# article path -> Bluesky post URI, recorded when an article is cross-posted
+POSTS_DB = 'bluesky_posts.db'
+_posts_db_local = threading.local()
+# Lookups that found a URI; misses aren't cached since another worker may post it
+_post_uri_cache = {}
+
+def get_posts_db():
+    """Return this thread's connection to the post mapping database, creating the table on first use"""
+    conn = getattr(_posts_db_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(POSTS_DB)
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS article_post (
+                article_path TEXT PRIMARY KEY,
+                post_uri TEXT NOT NULL,
+                posted_at TEXT NOT NULL
+            )
+        ''')
+        _posts_db_local.conn = conn
+    return conn
+
+def save_bluesky_post_uri(article_path, post_uri):
+    """Remember which Bluesky post an article was published as"""
+    try:
+        conn = get_posts_db()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO article_post (article_path, post_uri, posted_at) VALUES (?, ?, ?)',
+                (article_path, post_uri, time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+            )
+        _post_uri_cache[article_path] = post_uri
+    except sqlite3.Error as e:
+        logging.error(f"❌ Failed to record Bluesky post for {article_path}: {e}")
+
+# Reply levels fetched for comments; deeper replies would silently go missing
+REPLY_THREAD_DEPTH = 6
+
+def iter_thread_posts(thread):
+    """Yield the reply posts under a getPostThread node in depth-first thread order
+
+    Children are pushed in reverse so they pop in order; nodes without a
+    post (notFound, blocked) are skipped along with their subtrees.
+    """
+    stack = list(reversed((thread or {}).get('replies') or ()))
+    while stack:
+        reply = stack.pop()
+        post = reply.get('post')
+        if post is None:
+            continue
+        yield post
+        stack.extend(reversed(reply.get('replies') or ()))
+
+def build_post_text(summary, link_line, tags_line):
+    """Compose a post: summary, "Read more: <URL>" and hashtags, blank-line separated, skipping empty parts"""
+    return "\n\n".join(part for part in (summary, link_line, tags_line) if part)
 
 class BlueskyIntegration:
+    API_BASE = "https://bsky.social/xrpc"
+    URL_CREATE_SESSION = f"{API_BASE}/com.atproto.server.createSession"
+    URL_REFRESH_SESSION = f"{API_BASE}/com.atproto.server.refreshSession"
+    URL_CREATE_RECORD = f"{API_BASE}/com.atproto.repo.createRecord"
+    URL_UPLOAD_BLOB = f"{API_BASE}/com.atproto.repo.uploadBlob"
+    URL_POST_THREAD = f"{API_BASE}/app.bsky.feed.getPostThread"
+    URL_GET_POSTS = f"{API_BASE}/app.bsky.feed.getPosts"
+
     def __init__(self):
-        self.api_base = "https://bsky.social/xrpc"
+        self.api_base = self.API_BASE
         self.session = None
-        self.config = self.load_config()
+        # Authorization header for self.session, rebuilt only when the session changes
+        self.auth_headers = None
+        # Whether the last failed post_article call is safe to try again,
+        # i.e. it failed before createRecord was sent or on authentication
+        self.retryable = False
+        
+    @property
+    def config(self):
+        """Current config.json contents, so a long-lived instance sees credential changes"""
+        return load_config()
+        
+    def has_credentials(self):
+        """Whether a Bluesky handle and app password are configured"""
+        config = self.config
+        return bool(config and config.get('bluesky_handle') and config.get('bluesky_app_password'))
         
-    def authenticate(self):
-        """Authenticate with Bluesky using stored credentials"""
-        if not self.config or not self.config.get('bluesky_handle') or not self.config.get('bluesky_app_password'):
+    def authenticate(self, force=False):
+        """Authenticate with Bluesky using stored credentials, reusing a recent session"""
+        if not self.has_credentials():
             logging.warning("Bluesky credentials not configured")
             return False
+        
+        key = (self.config['bluesky_handle'], self.config['bluesky_app_password'])
+        with _auth_lock:
+            if not force:
+                if _auth_cache['key'] != key or time.time() >= _auth_cache['expires_at'] - BLUESKY_SESSION_MARGIN:
+                    # Another process may already have logged in or refreshed
+                    saved = load_saved_session(key[0])
+                    if saved and (_auth_cache['key'] != key or session_expiry(saved) > _auth_cache['expires_at']):
+                        _auth_cache.update(key=key, session=saved, expires_at=session_expiry(saved))
+                if _auth_cache['key'] == key:
+                    if time.time() < _auth_cache['expires_at'] - BLUESKY_SESSION_MARGIN:
+                        self.use_session(_auth_cache['session'])
+                        return True
+                    if self.refresh_session(_auth_cache['session']):
+                        return True
             
+            try:
+                response = bluesky_http.post(
+                    self.URL_CREATE_SESSION,
+                    timeout=BLUESKY_TIMEOUT,
+                    json={
+                        "identifier": key[0],
+                        "password": key[1]
+                    }
+                )
+                
+                if response.status_code == 200:
+                    self.use_session(response.json())
+                    _auth_cache.update(key=key, session=self.session, expires_at=session_expiry(self.session))
+                    save_session(key[0], self.session)
+                    logging.info("✅ Authenticated with Bluesky successfully")
+                    return True
+                else:
+                    _auth_cache['key'] = None
+                    logging.error(f"❌ Bluesky authentication failed: {response.text}")
+                    return False
+                    
+            except Exception as e:
+                logging.error(f"❌ Bluesky authentication error: {e}")
+                return False
+    
+    def refresh_session(self, session):
+        """Swap a session's refreshJwt for new tokens, caller must hold _auth_lock"""
         try:
-            response = requests.post(
-                f"{self.api_base}/com.atproto.server.createSession",
-                json={
-                    "identifier": self.config['bluesky_handle'],
-                    "password": self.config['bluesky_app_password']
-                }
+            response = bluesky_http.post(
+                self.URL_REFRESH_SESSION,
+                timeout=BLUESKY_TIMEOUT,
+                headers={"Authorization": f"Bearer {session['refreshJwt']}"}
             )
-            
             if response.status_code == 200:
-                self.session = response.json()
-                logging.info("✅ Authenticated with Bluesky successfully")
+                self.use_session({**session, **response.json()})
+                _auth_cache.update(session=self.session, expires_at=session_expiry(self.session))
+                save_session(_auth_cache['key'][0], self.session)
                 return True
-            else:
-                logging.error(f"❌ Bluesky authentication failed: {response.text}")
-                return False
-                
+            logging.warning(f"⚠️ Bluesky session refresh failed: {response.text}")
         except Exception as e:
-            logging.error(f"❌ Bluesky authentication error: {e}")
-            return False
+            logging.warning(f"⚠️ Bluesky session refresh error: {e}")
+        return False
+    
+    def invalidate_session(self):
+        """Forget the cached session so the next call logs in again"""
+        with _auth_lock:
+            if _auth_cache['session'] is self.session:
+                _auth_cache['key'] = None
+                try:
+                    os.remove(BLUESKY_SESSION_FILE)
+                except FileNotFoundError:
+                    pass
+        self.session = None
+        self.auth_headers = None
+    
+    def use_session(self, session):
+        """Adopt a createSession/refreshSession result and its Authorization header"""
+        self.session = session
+        self.auth_headers = {"Authorization": f"Bearer {session['accessJwt']}"}
     
-    def post_article(self, title, content_preview, article_url, image_url=None):
-        """Post a new article to Bluesky"""
+    def post_article(self, title, content_preview, article_url, image_url=None, article_path=None):
+        """Post a new article to Bluesky, recording the post URI under article_path when given"""
+        self.retryable = False
         if not self.authenticate():
+            # Nothing was sent; a login failure may clear up, missing credentials won't
+            self.retryable = self.has_credentials()
             return None
             
+        sent = False
         try:
             # Load public_base_url for proper links
             link = (article_url or '').strip()
@@ -59,48 +372,37 @@ class BlueskyIntegration:
             except Exception:
                 pass
 
-            # Build hashtags: keep previous defaults and merge with provided example, deduplicated
-            default_tags = ["#daveknowstech", "#blog", "#blogpost", "#tech", "#techblog"]
-            example_tags = ["#vibecode", "#ai", "#ssh", "#tech", "#ssh", "#daveknowstech"]
-            seen = set()
-            merged_tags = []
-            for tag in default_tags + example_tags:
-                if tag not in seen:
-                    seen.add(tag)
-                    merged_tags.append(tag)
-            hashtags_line = " ".join(merged_tags)
+            hashtags_line = POST_HASHTAGS_LINE
 
             summary = (title or '').strip()
 
-            # Compose multiline template:
-            # Line 1: summary/title
-            # Line 2: Read more: <URL>
-            # Line 3: hashtags
-            def build_text(s, tags_str):
-                parts = []
-                if s:
-                    parts.append(s)
-                if link:
-                    parts.append(f"Read more: {link}")
-                if tags_str:
-                    parts.append(tags_str)
-                return "\n\n".join(parts)
-
-            post_text = build_text(summary, hashtags_line)
+            link_line = f"Read more: {link}" if link else ""
+
+            post_text = build_post_text(summary, link_line, hashtags_line)
             max_len = 300
+            # Summary as it appears in post_text, used to place the link facet
+            shown_summary = summary
 
-            # If too long, first drop trailing hashtags one by one, then trim summary with ellipsis
+            # If too long, first drop trailing hashtags, then trim summary with ellipsis
             if len(post_text) > max_len:
-                tags = merged_tags.copy()
-                while len(post_text) > max_len and tags:
-                    tags.pop()  # drop last tag
-                    post_text = build_text(summary, " ".join(tags))
+                # Keep the longest run of leading tags that fits after the summary and link
+                base_text = build_post_text(summary, link_line, "")
+                budget = max_len - len(base_text) - (2 if base_text else 0)
+                tags_len = -1
+                kept = 0
+                for tag in POST_HASHTAGS:
+                    tags_len += len(tag) + 1
+                    if tags_len > budget:
+                        break
+                    kept += 1
+                tags = POST_HASHTAGS[:kept]
+                post_text = build_post_text(summary, link_line, " ".join(tags))
                 if len(post_text) > max_len:
                     # Need to trim the summary to fit within the remaining budget
                     # Keep link and whatever tags remain if possible
                     remaining_tags = " ".join(tags)
                     # Compute fixed portion length when title is empty
-                    fixed_text = build_text("", remaining_tags)
+                    fixed_text = build_post_text("", link_line, remaining_tags)
                     # If both link and tags absent, fixed_text may be empty; account for separators when title exists
                     # We'll rebuild iteratively trimming the summary
                     if not fixed_text:
@@ -117,25 +419,27 @@ class BlueskyIntegration:
                         if budget <= 0:
                             # No room for summary; keep only fixed_text, and if still too long, trim tags already handled
                             post_text = fixed_text[:max_len]
+                            shown_summary = ""
                         else:
                             trimmed_summary = summary if len(summary) <= budget else (summary[:max(0, budget-1)] + '…')
                             post_text = trimmed_summary + sep + fixed_text
+                            shown_summary = trimmed_summary
 
             # Build facets for links and hashtags so they are clickable
             facets = []
             
-            # Helper: build UTF-8 byte position map for the text
-            byte_pos = [0]
-            for ch in post_text:
-                byte_pos.append(byte_pos[-1] + len(ch.encode('utf-8')))
+            # Helper: convert a character span to the UTF-8 byte offsets facets use;
+            # only a handful of spans are needed, so encode the slices on demand
             def to_bytes(char_start, char_end):
-                return byte_pos[char_start], byte_pos[char_end]
+                byte_start = len(post_text[:char_start].encode('utf-8'))
+                return byte_start, byte_start + len(post_text[char_start:char_end].encode('utf-8'))
 
-            # Link facet, if a link is present in the composed text
+            # Link facet, if a link is present in the composed text; the link
+            # line follows the summary, so its offset is known without searching
             if link:
-                link_start = post_text.find(link)
-                if link_start != -1:
-                    link_end = link_start + len(link)
+                link_start = (len(shown_summary) + 2 if shown_summary else 0) + len("Read more: ")
+                link_end = link_start + len(link)
+                if link_end <= len(post_text):
                     b_start, b_end = to_bytes(link_start, link_end)
                     facets.append({
                         "index": {"byteStart": b_start, "byteEnd": b_end},
@@ -143,7 +447,7 @@ class BlueskyIntegration:
                     })
 
             # Hashtag facets: annotate each #tag sequence
-            for m in re.finditer(r"(?<!\w)#([A-Za-z0-9_]+)", post_text):
+            for m in HASHTAG_RE.finditer(post_text):
                 tag_text = m.group(0)  # includes '#'
                 tag = m.group(1)       # without '#'
                 start = m.start()
@@ -155,7 +459,7 @@ class BlueskyIntegration:
                 })
 
             # Create the record with valid RFC-3339/ISO-8601 UTC timestamp
-            created_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace('+00:00', 'Z')
+            created_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             record = {
                 "$type": "app.bsky.feed.post",
                 "text": post_text,
@@ -164,13 +468,13 @@ class BlueskyIntegration:
             if facets:
                 record["facets"] = facets
             
-            # Post to Bluesky (with facets for rich text)
-            response = requests.post(
-                f"{self.api_base}/com.atproto.repo.createRecord",
-                headers={
-                    "Authorization": f"Bearer {self.session['accessJwt']}",
-                    "Content-Type": "application/json"
-                },
+            # Post to Bluesky (with facets for rich text); past this point a
+            # timeout may still have created the post, so it is not retried
+            sent = True
+            response = bluesky_http.post(
+                self.URL_CREATE_RECORD,
+                timeout=BLUESKY_TIMEOUT,
+                headers=self.auth_headers,
                 json={
                     "repo": self.session["did"],
                     "collection": "app.bsky.feed.post",
@@ -181,31 +485,47 @@ class BlueskyIntegration:
             if response.status_code == 200:
                 post_data = response.json()
                 logging.info(f"✅ Posted to Bluesky: {title}")
+                if article_path:
+                    save_bluesky_post_uri(article_path, post_data['uri'])
                 return post_data['uri']
             else:
+                if response.status_code in (400, 401):
+                    # Most likely an expired or revoked token
+                    self.invalidate_session()
+                    self.retryable = True
                 logging.error(f"❌ Failed to post to Bluesky: {response.text}")
                 return None
                 
         except Exception as e:
+            self.retryable = not sent
             logging.error(f"❌ Error posting to Bluesky: {e}")
             return None
     
     def upload_image(self, image_url):
         """Upload image to Bluesky for embedding"""
         try:
-            # Download the image
-            img_response = requests.get(image_url, timeout=10)
-            if img_response.status_code != 200:
-                return None
+            # Stream the download so an oversized image is abandoned as soon
+            # as it passes Bluesky's blob limit instead of after a full read
+            with bluesky_http.get(image_url, timeout=10, stream=True) as img_response:
+                if img_response.status_code != 200:
+                    return None
+                content_type = img_response.headers.get('content-type', 'image/jpeg')
+                if int(img_response.headers.get('content-length') or 0) > BLUESKY_MAX_IMAGE_BYTES:
+                    logging.warning(f"⚠️ Image too large for Bluesky: {image_url}")
+                    return None
+                image_data = bytearray()
+                for chunk in img_response.iter_content(65536):
+                    image_data += chunk
+                    if len(image_data) > BLUESKY_MAX_IMAGE_BYTES:
+                        logging.warning(f"⚠️ Image too large for Bluesky: {image_url}")
+                        return None
                 
             # Upload to Bluesky
-            upload_response = requests.post(
-                f"{self.api_base}/com.atproto.repo.uploadBlob",
-                headers={
-                    "Authorization": f"Bearer {self.session['accessJwt']}",
-                    "Content-Type": img_response.headers.get('content-type', 'image/jpeg')
-                },
-                data=img_response.content
+            upload_response = bluesky_http.post(
+                self.URL_UPLOAD_BLOB,
+                timeout=BLUESKY_TIMEOUT,
+                headers={**self.auth_headers, "Content-Type": content_type},
+                data=bytes(image_data)
             )
             
             if upload_response.status_code == 200:
@@ -218,38 +538,26 @@ class BlueskyIntegration:
     
     def get_post_engagement(self, post_uri):
         """Get engagement stats for a Bluesky post"""
+        if not self.authenticate():
+            return {"likes": 0, "reposts": 0, "replies": 0}
+            
         try:
-            response = requests.get(
-                f"{self.api_base}/com.atproto.repo.getRecord",
-                params={
-                    "repo": self.session["did"],
-                    "collection": "app.bsky.feed.post",
-                    "rkey": post_uri.split('/')[-1]
-                },
-                headers={
-                    "Authorization": f"Bearer {self.session['accessJwt']}"
-                }
+            # The thread view carries the counts; depth 0 skips fetching replies
+            response = bluesky_http.get(
+                self.URL_POST_THREAD,
+                timeout=BLUESKY_TIMEOUT,
+                params={"uri": post_uri, "depth": 0},
+                headers=self.auth_headers
             )
             
             if response.status_code == 200:
-                post_data = response.json()
-                
-                # Get thread view for engagement stats
-                thread_response = requests.get(
-                    f"{self.api_base}/app.bsky.feed.getPostThread",
-                    params={"uri": post_uri},
-                    headers={"Authorization": f"Bearer {self.session['accessJwt']}"}
-                )
+                post = response.json()['thread']['post']
                 
-                if thread_response.status_code == 200:
-                    thread_data = thread_response.json()
-                    post = thread_data['thread']['post']
-                    
-                    return {
-                        "likes": post.get('likeCount', 0),
-                        "reposts": post.get('repostCount', 0),
-                        "replies": post.get('replyCount', 0)
-                    }
+                return {
+                    "likes": post.get('likeCount', 0),
+                    "reposts": post.get('repostCount', 0),
+                    "replies": post.get('replyCount', 0)
+                }
             
             return {"likes": 0, "reposts": 0, "replies": 0}
             
@@ -257,44 +565,79 @@ class BlueskyIntegration:
             logging.error(f"❌ Error getting Bluesky engagement: {e}")
             return {"likes": 0, "reposts": 0, "replies": 0}
     
-    def get_post_replies(self, post_uri):
+    def get_posts_engagement(self, post_uris):
+        """Get engagement stats for many posts, GET_POSTS_BATCH_SIZE per request, keyed by URI"""
+        stats = {}
+        if not post_uris or not self.authenticate():
+            return stats
+        
+        headers = self.auth_headers
+        def fetch(chunk):
+            try:
+                response = bluesky_http.get(
+                    self.URL_GET_POSTS,
+                    timeout=BLUESKY_TIMEOUT,
+                    params=[('uris', uri) for uri in chunk],
+                    headers=headers
+                )
+                if response.status_code != 200:
+                    logging.warning(f"⚠️ Bluesky getPosts failed: {response.text}")
+                    return ()
+                return response.json().get('posts', ())
+            except Exception as e:
+                logging.error(f"❌ Error getting Bluesky engagement: {e}")
+                return ()
+        
+        chunks = [post_uris[i:i + GET_POSTS_BATCH_SIZE] for i in range(0, len(post_uris), GET_POSTS_BATCH_SIZE)]
+        if len(chunks) == 1:
+            results = [fetch(chunks[0])]
+        else:
+            # Requests are I/O-bound, so overlap them rather than paying each round-trip in turn
+            with ThreadPoolExecutor(max_workers=min(GET_POSTS_MAX_WORKERS, len(chunks))) as executor:
+                results = executor.map(fetch, chunks)
+        
+        for posts in results:
+            for post in posts:
+                stats[post['uri']] = {
+                    "likes": post.get('likeCount', 0),
+                    "reposts": post.get('repostCount', 0),
+                    "replies": post.get('replyCount', 0)
+                }
+        return stats
+    
+    def get_post_replies(self, post_uri, depth=REPLY_THREAD_DEPTH):
         """Get replies to a Bluesky post for displaying as comments"""
+        if not self.authenticate():
+            return []
+            
         try:
-            response = requests.get(
-                f"{self.api_base}/app.bsky.feed.getPostThread",
+            response = bluesky_http.get(
+                self.URL_POST_THREAD,
+                timeout=BLUESKY_TIMEOUT,
                 params={
                     "uri": post_uri,
-                    "depth": 2  # Get replies and their replies
+                    "depth": depth
                 },
-                headers={
-                    "Authorization": f"Bearer {self.session['accessJwt']}"
-                }
+                headers=self.auth_headers
             )
             
             if response.status_code == 200:
                 thread_data = response.json()
                 replies = []
                 
-                def extract_replies(thread_item):
-                    if 'replies' in thread_item:
-                        for reply in thread_item['replies']:
-                            if 'post' in reply:
-                                post = reply['post']
-                                replies.append({
-                                    'author': {
-                                        'displayName': post['author'].get('displayName', ''),
-                                        'handle': post['author']['handle'],
-                                        'avatar': post['author'].get('avatar', '')
-                                    },
-                                    'text': post['record']['text'],
-                                    'createdAt': post['record']['createdAt'],
-                                    'uri': post['uri']
-                                })
-                                # Recursively get nested replies
-                                extract_replies(reply)
-                
-                if 'thread' in thread_data and 'replies' in thread_data['thread']:
-                    extract_replies(thread_data['thread'])
+                for post in iter_thread_posts(thread_data.get('thread')):
+                    author = post['author']
+                    record = post['record']
+                    replies.append({
+                        'author': {
+                            'displayName': author.get('displayName', ''),
+                            'handle': author['handle'],
+                            'avatar': author.get('avatar', '')
+                        },
+                        'text': record['text'],
+                        'createdAt': record['createdAt'],
+                        'uri': post['uri']
+                    })
                 
                 return replies
                 
@@ -304,49 +647,17 @@ class BlueskyIntegration:
 
     def load_config(self):
         """Load configuration from JSON file"""
-        try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return None
-        except json.JSONDecodeError:
-            return None
+        return load_config()
             
     def save_config(self, config):
         """Save configuration to JSON file"""
-        try:
-            with open('config.json', 'w') as f:
-                json.dump(config, f, indent=2)
-            return True
-        except Exception as e:
-            logging.error(f"Error saving config: {e}")
-            return False
+        return save_config(config)
 
 # Integration functions for app.py
 def setup_bluesky_routes(app):
     """Add Bluesky-related routes to the Flask app"""
     from flask import request, jsonify
     
-    def load_config():
-        """Load configuration from JSON file"""
-        try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return None
-        except json.JSONDecodeError:
-            return None
-    
-    def save_config(config):
-        """Save configuration to JSON file"""
-        try:
-            with open('config.json', 'w') as f:
-                json.dump(config, f, indent=2)
-            return True
-        except Exception as e:
-            logging.error(f"Error saving config: {e}")
-            return False
-    
     @app.route('/api/config/bluesky', methods=['POST'])
     def set_bluesky_config():
         """Configure Bluesky credentials"""
@@ -391,7 +702,8 @@ def setup_bluesky_routes(app):
             title=data['title'],
             content_preview=data.get('content', ''),
             article_url=data.get('url', ''),
-            image_url=data.get('image_url')
+            image_url=data.get('image_url'),
+            article_path=data.get('path')
         )
         
         if post_uri:
@@ -402,17 +714,40 @@ def setup_bluesky_routes(app):
     @app.route('/api/bluesky/stats/<path:article_path>')
     def get_article_bluesky_stats(article_path):
         """Get Bluesky engagement stats for an article"""
-        # Look up the Bluesky post URI for this article
-        # This would require storing the mapping when you post
-        bluesky = BlueskyIntegration()
+        # Look up the Bluesky post URI recorded when the article was posted
         post_uri = get_bluesky_post_uri_for_article(article_path)
         
         if post_uri:
+            bluesky = BlueskyIntegration()
             stats = bluesky.get_post_engagement(post_uri)
             return jsonify(stats)
         
         return jsonify({"likes": 0, "reposts": 0, "replies": 0})
     
+    @app.route('/api/bluesky/stats-batch', methods=['POST'])
+    def get_articles_bluesky_stats():
+        """Get Bluesky engagement stats for several articles in one go"""
+        data = request.get_json(silent=True)
+        paths = data.get('paths') if isinstance(data, dict) else None
+        if not isinstance(paths, list):
+            return jsonify({'error': 'paths array required'}), 400
+        if len(paths) > STATS_BATCH_MAX_PATHS:
+            return jsonify({'error': f'At most {STATS_BATCH_MAX_PATHS} paths per request'}), 400
+        if not all(isinstance(path, str) for path in paths):
+            return jsonify({'error': 'paths must be strings'}), 400
+        paths = list(dict.fromkeys(paths))
+        
+        uris = {}
+        for path in paths:
+            post_uri = get_bluesky_post_uri_for_article(path)
+            if post_uri:
+                uris[path] = post_uri
+        
+        bluesky = BlueskyIntegration()
+        engagement = bluesky.get_posts_engagement(list(dict.fromkeys(uris.values())))
+        empty = {"likes": 0, "reposts": 0, "replies": 0}
+        return jsonify({path: engagement.get(uris.get(path), empty) for path in paths})
+    
     @app.route('/api/bluesky/test-connection', methods=['POST'])
     def test_bluesky_connection():
         """Test Bluesky credentials"""
@@ -423,7 +758,7 @@ def setup_bluesky_routes(app):
             return jsonify({'error': 'Authentication required'}), 401
         
         bluesky = BlueskyIntegration()
-        success = bluesky.authenticate()
+        success = bluesky.authenticate(force=True)
         
         if success:
             return jsonify({'success': True, 'message': 'Bluesky connection successful!'})
@@ -432,6 +767,17 @@ def setup_bluesky_routes(app):
 
 def get_bluesky_post_uri_for_article(article_path):
     """Get the Bluesky post URI for an article path"""
-    # You'd need to store this mapping in your database
-    # when articles are posted to Bluesky
+    post_uri = _post_uri_cache.get(article_path)
+    if post_uri:
+        return post_uri
+    try:
+        row = get_posts_db().execute(
+            'SELECT post_uri FROM article_post WHERE article_path = ?', (article_path,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        logging.error(f"❌ Failed to look up Bluesky post for {article_path}: {e}")
+        return None
+    if row:
+        _post_uri_cache[article_path] = row[0]
+        return row[0]
     return None